@@ -187,6 +187,15 @@ def render_hyperparameters(algorithm):
     key=f"{algorithm}_gamma"
   )
   
+  # Random seed - common to the learning algorithms and RTDP's sampled trials
+  if not algo['requires_model'] or algorithm == 'RTDP':
+    seed = st.number_input(
+      "Random Seed", min_value=0, value=0, step=1,
+      help="Seeds exploration, RTDP trials, environment resets and the TicTacToe opponent so runs on the same environment are reproducible (0 = unseeded)",
+      key=f"{algorithm}_seed"
+    )
+    st.session_state.params['seed'] = int(seed) or None
+  
   # Dynamic Programming parameters
   if algo['type'] == 'Dynamic Programming':
     st.session_state.params['theta'] = st.slider(
@@ -199,7 +208,65 @@ def render_hyperparameters(algorithm):
       help="Maximum number of iterations",
       key=f"{algorithm}_max_iterations"
     )
-  
+    st.session_state.params['prune'] = st.checkbox(
+      "Prune Unreachable States", value=True,
+      help="Build the model only over states reachable from the start state(s)",
+      key=f"{algorithm}_prune"
+    )
+
+    # Value Iteration specific
+    if algorithm == 'Value Iteration':
+      st.session_state.params['gamma_sweep'] = st.multiselect(
+        "Also Solve for γ", [0.5, 0.8, 0.9, 0.95, 0.98, 0.999],
+        help="Solve additional discount factors in the same batched run; each is saved as its own run",
+        key=f"{algorithm}_gamma_sweep"
+      )
+
+    # RTDP specific
+    if algorithm == 'RTDP':
+      if st.checkbox(
+        "Derive Initial Value", value=True,
+        help="Start unvisited states at the environment's reward bound / (1 - γ), an upper bound on the optimal value",
+        key=f"{algorithm}_auto_initial_value"
+      ):
+        st.session_state.params['initial_value'] = None
+      else:
+        st.session_state.params['initial_value'] = st.number_input(
+          "Initial Value", value=0.0, step=0.5,
+          help="Value of states not yet visited; an upper bound on the optimal value makes the solved labels exact",
+          key=f"{algorithm}_initial_value"
+        )
+        st.warning("RTDP only converges to optimal values if the initial value upper-bounds every optimal value")
+
+    # Policy Iteration specific
+    if algorithm == 'Policy Iteration':
+      st.session_state.params['eval_sweeps'] = st.selectbox(
+        "Evaluation Sweeps", ["full", "adaptive", 1, 3, 5, 10, 20],
+        format_func=lambda x: {"full": "Full evaluation", "adaptive": "Adaptive"}.get(x, f"{x} per improvement"),
+        help="Modified policy iteration: warm-started evaluation truncated to k sweeps",
+        key=f"{algorithm}_eval_sweeps"
+      )
+      # Truncated evaluation always uses Bellman sweeps, so the method only applies to full evaluation
+      if st.session_state.params['eval_sweeps'] == "full":
+        st.session_state.params['eval_method'] = st.selectbox(
+          "Policy Evaluation", ["direct", "iterative", "gmres", "bicgstab"],
+          format_func=lambda x: {"direct": "Exact (sparse solve)", "iterative": "Iterative sweeps",
+                                 "gmres": "GMRES", "bicgstab": "BiCGSTAB"}[x],
+          help="How V is computed for each policy: exact linear solve, Bellman sweeps or a Krylov solver",
+          key=f"{algorithm}_eval_method"
+        )
+      else:
+        st.session_state.params.pop('eval_method', None)
+
+  # Game solver parameters
+  elif algo['type'] == 'Game Solver':
+    st.session_state.params['opponent'] = st.selectbox(
+      "Opponent Model", ["random", "minimax"],
+      format_func=lambda x: "Random (as in the environment)" if x == "random" else "Perfect play",
+      help="Expectimax against the environment's random opponent, or minimax against a perfect one",
+      key=f"{algorithm}_opponent"
+    )
+
   # Monte Carlo parameters
   elif algo['type'] == 'Monte Carlo':
     st.session_state.params['episodes'] = st.slider(
@@ -261,7 +328,7 @@ def render_hyperparameters(algorithm):
     # n-step TD specific
     if algorithm == 'n-step TD':
       st.session_state.params['n_steps'] = st.slider(
-        "n (steps)", 1, 10, 3, 1,
+        "n (steps)", 1, 100, 3, 1,
         help="Number of steps for n-step returns",
         key=f"{algorithm}_n_steps"
       )
@@ -288,5 +355,10 @@ def render_hyperparameters(algorithm):
       help="Decay rate for exploration",
       key=f"{algorithm}_epsilon_decay"
     )
+    st.session_state.params['n_envs'] = st.selectbox(
+      "Parallel Environments", [1, 16, 64, 256, 1024, 4096],
+      help="Copies of the environment stepped together; 1 trains on a single episode at a time",
+      key=f"{algorithm}_n_envs"
+    )
 
 
@@ -63,6 +63,7 @@ def run_training():
   st.markdown("### Parameters Being Used")
   st.json(params)
   
+  gamma_sweep = params.pop('gamma_sweep', None)
   agent = create_agent(st.session_state.selected_algorithm, env, **params)
   
   st.markdown("### Training Progress")
@@ -71,21 +72,30 @@ def run_training():
   metrics_placeholder = st.empty()
   
   try:
-    history = agent.train(
-      progress_callback=lambda p, m: update_training_ui(p, m, progress_bar, status_text, metrics_placeholder)
-    )
+    if gamma_sweep and hasattr(agent, 'train_batch'):
+      # The selected gamma comes first so the agent keeps its solution
+      gammas = [params['gamma']] + [g for g in gamma_sweep if g != params['gamma']]
+      histories = agent.train_batch(gammas)
+      history = histories[0]
+      runs = [({**params, 'gamma': g}, h) for g, h in zip(gammas, histories)]
+    else:
+      history = agent.train(
+        progress_callback=lambda p, m: update_training_ui(p, m, progress_bar, status_text, metrics_placeholder)
+      )
+      runs = [(params, history)]
     
     st.session_state.trained_agent = agent
     st.session_state.training_history = history
     st.session_state.training_complete = True
     
-    save_training_run(
-      st.session_state.selected_environment,
-      st.session_state.selected_algorithm,
-      params,
-      history,
-      agent
-    )
+    for run_params, run_history in runs:
+      save_training_run(
+        st.session_state.selected_environment,
+        st.session_state.selected_algorithm,
+        run_params,
+        run_history,
+        agent
+      )
     
     progress_bar.progress(100)
     status_text.success("Training completed successfully!")
@@ -173,7 +183,8 @@ def render_training_results():
       col1, col2, col3 = st.columns([1, 2, 1])
       with col2:
           st.markdown("#### Learned Policy")
-          fig = plot_policy(st.session_state.trained_agent.Q, env)
+          fig = plot_policy(st.session_state.trained_agent.Q, env,
+                            action_gaps=getattr(st.session_state.trained_agent, 'action_gaps', None))
           st.pyplot(fig)
       
       # Plot Q-Values
@@ -112,8 +112,8 @@ def plot_value_function(V, env):
         return fig
 
 
-def plot_policy(Q_or_pi, env, from_q=True):
-    """Plot policy from Q-values or policy array"""
+def plot_policy(Q_or_pi, env, from_q=True, action_gaps=None):
+    """Plot policy from Q-values or policy array; arrows fade where the action gap is small"""
 
     pi = np.argmax(Q_or_pi, axis=1) if from_q else Q_or_pi
     n_states = len(pi)
@@ -126,11 +126,16 @@ def plot_policy(Q_or_pi, env, from_q=True):
         cmap = mpl.colormaps.get_cmap('tab10').resampled(4)
         im = ax.imshow(pi_grid, cmap=cmap, vmin=0, vmax=3)
 
+        alpha_grid = np.ones((size, size))
+        if action_gaps is not None:
+            gap_grid = np.nan_to_num(np.asarray(action_gaps), nan=0.0).reshape(size, size)
+            alpha_grid = 0.3 + 0.7 * gap_grid / (gap_grid.max() or 1.0)
+
         arrows = {0: '↑', 1: '→', 2: '↓', 3: '←'}
         for i in range(size):
             for j in range(size):
                 ax.text(j, i, arrows[pi_grid[i, j]],
-                        ha='center', va='center',
+                        ha='center', va='center', alpha=alpha_grid[i, j],
                         fontsize=24, color='white', fontweight='bold')
 
         ax.set_title('Learned Policy', fontsize=14, fontweight='bold')
@@ -1,11 +1,13 @@
 """RL Core - Algorithms and Agent Wrappers"""
 
-from rl.core import dp, mc, td, qlearning
+from rl.core import dp, mdp, model_cache, minimax, exploration, mc, td, qlearning, batched
 from rl.core.wrappers import (
     Agent,
     ValueIterationAgent,
     PolicyIterationAgent,
     PolicyEvaluationAgent,
+    RTDPAgent,
+    MinimaxAgent,
     MonteCarloAgent,
     QLearningAgent,
     TD0Agent,
@@ -15,11 +17,13 @@ from rl.core.wrappers import (
 )
 
 __all__ = [
-    'dp', 'mc', 'td', 'qlearning',
+    'dp', 'mdp', 'model_cache', 'minimax', 'exploration', 'mc', 'td', 'qlearning', 'batched',
     'Agent',
     'ValueIterationAgent',
     'PolicyIterationAgent',
     'PolicyEvaluationAgent',
+    'RTDPAgent',
+    'MinimaxAgent',
     'MonteCarloAgent',
     'QLearningAgent',
     'TD0Agent',
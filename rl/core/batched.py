@@ -0,0 +1,66 @@
+from typing import List, Tuple, Dict
+import numpy as np
+from rl.core.exploration import ExplorationNoise
+
+
+def average_update(Q: np.ndarray, states: np.ndarray, actions: np.ndarray, targets: np.ndarray, alpha: float):
+    # Copies that hit the same (s, a) in one step share a single update towards their mean target
+    n_actions = Q.shape[1]
+    pairs, inverse = np.unique(states * n_actions + actions, return_inverse=True)
+    mean_target = np.bincount(inverse, weights=targets) / np.bincount(inverse)
+    Q_flat = Q.reshape(-1)
+    Q_flat[pairs] += alpha * (mean_target - Q_flat[pairs])
+
+def batched_td_control(state_space: List[int], actions: List[int], env, n_envs: int = 64,
+                       episodes: int = 1000, alpha: float = 0.1, gamma: float = 1.0,
+                       epsilon: float = 0.3, on_policy: bool = False, Q: np.ndarray = None,
+                       noise: ExplorationNoise = None, max_steps: int = 1000) -> Tuple[np.ndarray, np.ndarray, Dict]:
+
+    # Q-learning (on_policy=False) or SARSA over n_envs copies of a batch environment
+    # (see BaseEnvironment.vectorize), stepped together until `episodes` episodes finish.
+    # Episodes longer than max_steps are cut off without treating the last state as terminal.
+    if Q is None:
+        Q = np.zeros((len(state_space), len(actions)))
+    if noise is None:
+        noise = ExplorationNoise(len(actions))
+
+    episode_rewards = []
+    episode_lengths = []
+    returns = np.zeros(n_envs)
+    lengths = np.zeros(n_envs, dtype=np.int64)
+
+    states = env.reset_batch(n_envs)
+    chosen = noise.epsilon_greedy_batch(Q[states], epsilon)
+    while len(episode_rewards) < episodes:
+        next_states, rewards, dones = env.step_batch(chosen)
+        returns += rewards
+        lengths += 1
+
+        cut = ~dones & (lengths >= max_steps)
+        current = env.restart_batch(cut) if cut.any() else env.batch_states.copy()
+
+        if on_policy:
+            # Copies that carry on bootstrap on the action they take next; cut-off copies
+            # restarted elsewhere, so their successor gets an action drawn just for the target
+            next_chosen = noise.epsilon_greedy_batch(Q[current], epsilon)
+            target_actions = next_chosen.copy()
+            if cut.any():
+                target_actions[cut] = noise.epsilon_greedy_batch(Q[next_states[cut]], epsilon)
+            bootstrap = Q[next_states, target_actions]
+        else:
+            bootstrap = Q[next_states].max(axis=1)
+        average_update(Q, states, chosen, rewards + gamma * np.where(dones, 0.0, bootstrap), alpha)
+
+        finished = dones | cut
+        if finished.any():
+            episode_rewards.extend(returns[finished].tolist())
+            episode_lengths.extend(lengths[finished].tolist())
+            returns[finished] = 0.0
+            lengths[finished] = 0
+
+        states = current
+        chosen = next_chosen if on_policy else noise.epsilon_greedy_batch(Q[states], epsilon)
+
+    policy = np.argmax(Q, axis=1)
+    stats = {'episode_rewards': episode_rewards[:episodes], 'episode_lengths': episode_lengths[:episodes]}
+    return Q, policy, stats
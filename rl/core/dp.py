@@ -1,5 +1,15 @@
-from typing import Dict, Tuple
+from typing import Callable, Dict, List, Tuple
+import os
 import random
+import time
+import warnings
+import numpy as np
+from scipy import sparse as sp
+from scipy.sparse import csgraph
+from scipy.sparse import linalg as spla
+from multiprocessing import Pool, shared_memory
+
+EVALUATION_METHODS = ('iterative', 'direct', 'gmres', 'bicgstab')
 
 def bellman_equation(P: Dict, R: Dict, V: Dict, gamma: float, state: int, mode: str = "VI", policy: Dict = None, action: int = None) -> float:
 
@@ -127,3 +137,763 @@ def policy_iteration(P: Dict, R: Dict, gamma: float, theta: float) -> Tuple[Dict
     }
     
     return V, policy, stats
+
+def rtdp(transition: Callable, actions: List[int], reset: Callable, gamma: float, theta: float,
+         trials: int = 1000, max_depth: int = 1000, initial_value: float = 0.0,
+         labelled: bool = True, initial_states: List[int] = None, rng: random.Random = None) -> Tuple[Dict, Dict]:
+
+    # transition(s, a) returns {next_state: (prob, reward)}; it is only queried for visited states.
+    # Labelled RTDP has converged once every start state (initial_states, or else the
+    # state reset() returns) is solved. Successors are sampled from rng, the global random by default
+    draw = (rng or random).random
+    V = {}
+    model = {}
+    solved = set()
+    backups = 0
+
+    def successors(state):
+        if state not in model:
+            model[state] = [list(transition(state, a).items()) for a in actions]
+        return model[state]
+
+    def lookahead(state):
+        q = [sum(prob * (reward + gamma * V.get(ns, initial_value)) for ns, (prob, reward) in trans)
+             for trans in successors(state)]
+        best = max(range(len(q)), key=q.__getitem__)
+        return best, q[best]
+
+    def backup(state):
+        nonlocal backups
+        best, value = lookahead(state)
+        residual = abs(value - V.get(state, initial_value))
+        V[state] = value
+        backups += 1
+        return best, residual
+
+    def check_solved(state):
+        # Label the greedy envelope of state solved once every residual in it is below theta
+        converged = True
+        open_states, closed = [state], []
+        seen = {state}
+        while open_states:
+            s = open_states.pop()
+            closed.append(s)
+            best, value = lookahead(s)
+            if abs(value - V.get(s, initial_value)) > theta:
+                converged = False
+                continue
+            for ns, (prob, _) in successors(s)[best]:
+                if prob > 0 and ns not in solved and ns not in seen:
+                    seen.add(ns)
+                    open_states.append(ns)
+
+        if converged:
+            solved.update(closed)
+        else:
+            for s in reversed(closed):
+                backup(s)
+        return converged
+
+    trial = 0
+    deltas = []
+    converged = False
+
+    while True:
+        state = reset()
+        if labelled:
+            pending = [s for s in (initial_states if initial_states is not None else [state]) if s not in solved]
+            converged = not pending
+            # Trials from a solved start would not back anything up
+            if pending and state in solved:
+                state = pending[0]
+        if converged or trial >= trials:
+            break
+        trial += 1
+
+        visited = []
+        max_residual = 0.0
+        while state not in solved and len(visited) < max_depth:
+            visited.append(state)
+            best, residual = backup(state)
+            max_residual = max(max_residual, residual)
+
+            # Follow the greedy action to a sampled successor
+            trans = successors(state)[best]
+            u, cumulative = draw(), 0.0
+            for ns, (prob, _) in trans:
+                cumulative += prob
+                if u < cumulative:
+                    break
+            state = ns
+
+        deltas.append(max_residual)
+
+        if labelled:
+            while visited and check_solved(visited.pop()):
+                pass
+        elif max_residual < theta:
+            converged = True
+            break
+
+    stats = {
+        'iterations': trial,
+        'deltas': deltas,
+        'converged': converged,
+        'backups': backups,
+        'visited_states': len(V),
+        'solved_states': len(solved)
+    }
+
+    return V, stats
+
+def value_iteration_array(model, gamma: float, theta: float, V0: np.ndarray = None) -> Tuple[np.ndarray, Dict]:
+
+    V = np.zeros(model.n_states) if V0 is None else V0.copy()
+
+    iteration = 0
+    deltas = []
+
+    while True:
+        iteration += 1
+        V_new = model.greedy_values(model.q_values(V, gamma))
+        delta = float(np.max(np.abs(V_new - V), initial=0.0))
+        V = V_new
+
+        deltas.append(delta)
+
+        if delta < theta:
+            break
+
+    stats = {
+        'iterations': iteration,
+        'deltas': deltas,
+        'backups': iteration * model.n_states
+    }
+
+    return V, stats
+
+def multigrid_value_iteration_array(model, gamma: float, theta: float, grid_shape: Tuple[int, int],
+                                    min_size: int = 8, smoothing_sweeps: int = 2) -> Tuple[np.ndarray, Dict]:
+
+    # Environment state s sits at row s // width, column s % width of the grid
+    height, width = grid_shape
+    ys, xs = np.divmod(model.states, width)
+
+    # Level l merges 2^l x 2^l blocks of cells; the coarsest level is solved first
+    levels = [np.arange(model.n_states)]
+    while max(height, width) >> len(levels) >= min_size:
+        shift = len(levels)
+        block = (ys >> shift) * ((width >> shift) + 1) + (xs >> shift)
+        _, groups = np.unique(block, return_inverse=True)
+        levels.append(groups)
+
+    V = None
+    actions = None
+    level_iterations = []
+    backups = 0
+    policy_solves = 0
+    solve_time = 0.0
+
+    for l in reversed(range(len(levels))):
+        groups = levels[l]
+        n_groups = int(groups.max()) + 1 if len(groups) else 0
+        level_model = model if l == 0 else model.aggregate(groups, n_groups)
+        sweeps = 0
+
+        if V is None:
+            V = np.zeros(n_groups)
+        else:
+            # Prolongation: every cell starts from the value and action of its parent block
+            parent = np.zeros(n_groups, dtype=np.int64)
+            parent[groups] = levels[l + 1]
+            V, inherited = V[parent], actions[parent]
+
+            for _ in range(smoothing_sweeps):
+                V = level_model.greedy_values(level_model.q_values(V, gamma))
+            sweeps += smoothing_sweeps
+
+            # Sweeps shift the block staircase but never break its ties, and a tie resolved
+            # towards a self-loop strands the cell; keep the parent's action on ties instead
+            Q = level_model.q_values(V, gamma)
+            states = np.arange(n_groups)
+            policy = np.where(Q[states, inherited] >= Q.max(axis=1), inherited, np.argmax(Q, axis=1))
+
+            # Values near absorbing goals are averaged away by the blocks and only decay by
+            # gamma per sweep; the greedy policy's exact values fix them in one solve
+            tick = time.perf_counter()
+            P_pi, r_pi = level_model.policy_model(level_model.deterministic_policy(policy))
+            V_pi = solve_policy_values(P_pi, r_pi, gamma, theta)
+            solve_time += time.perf_counter() - tick
+            policy_solves += 1
+            if V_pi is not None and np.all(np.isfinite(V_pi)):
+                V = V_pi
+
+        # Intermediate levels only seed the next one; the coarsest and the fine level converge
+        if l == 0 or l == len(levels) - 1:
+            V, level_stats = value_iteration_array(level_model, gamma, theta, V)
+            sweeps += level_stats['iterations']
+        if l > 0:
+            actions = np.argmax(level_model.q_values(V, gamma), axis=1)
+
+        level_iterations.append(sweeps)
+        backups += sweeps * level_model.n_states
+
+    # iterations / deltas describe the fine level; coarse sweeps show up in backups
+    stats = {
+        'iterations': level_stats['iterations'],
+        'deltas': level_stats['deltas'],
+        'backups': backups,
+        'level_iterations': level_iterations,
+        'policy_solves': policy_solves,
+        'solve_time': solve_time
+    }
+
+    return V, stats
+
+def batched_value_iteration_array(model, gammas, thetas, rewards: np.ndarray = None) -> Tuple[np.ndarray, list]:
+
+    # K configurations share one model: gammas (K,), thetas scalar or (K,), rewards (K, S, A) or None
+    gammas = np.asarray(gammas, dtype=float)
+    K, S, A = len(gammas), model.n_states, model.n_actions
+    thetas = np.broadcast_to(np.asarray(thetas, dtype=float), (K,))
+    R = np.broadcast_to(model.R if rewards is None else rewards, (K, S, A))
+    T = model.P if model.is_sparse else model.P.reshape(S * A, S)
+
+    V = np.zeros((K, S))
+    active = np.arange(K)
+    iterations = np.zeros(K, dtype=int)
+    deltas = [[] for _ in range(K)]
+
+    while active.size:
+        # One (S * A, S) @ (S, k) product backs up every unconverged configuration
+        expected = np.asarray(T @ V[active].T).T.reshape(len(active), S, A)
+        Q = np.where(model.mask, R[active] + gammas[active, None, None] * expected, -np.inf)
+        V_new = np.where(model.has_actions, Q.max(axis=2), 0.0)
+        delta = np.max(np.abs(V_new - V[active]), axis=1, initial=0.0)
+        V[active] = V_new
+
+        for k, d in zip(active, delta):
+            iterations[k] += 1
+            deltas[k].append(float(d))
+        active = active[delta >= thetas[active]]
+
+    stats = [
+        {
+            'iterations': int(iterations[k]),
+            'deltas': deltas[k],
+            'backups': int(iterations[k]) * S,
+            'gamma': float(gammas[k]),
+            'theta': float(thetas[k])
+        }
+        for k in range(K)
+    ]
+
+    return V, stats
+
+def _csr_gather(indptr: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+
+    # Positions of the stored entries of the given CSR rows, and the index into rows each belongs to
+    starts = indptr[rows]
+    counts = indptr[rows + 1] - starts
+    owner = np.repeat(np.arange(len(rows)), counts)
+    pos = np.arange(counts.sum()) + np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return pos, owner
+
+def prioritized_value_iteration_array(model, gamma: float, theta: float, batch_size: int = None) -> Tuple[np.ndarray, Dict]:
+
+    # Each iteration backs up the batch_size states of highest priority (S / 8, at least 256)
+    # together with array ops. It needs far fewer backups than full sweeps, but its
+    # bookkeeping keeps it slower in wall time than value_iteration_array below ~10^4 states
+    S, A = model.n_states, model.n_actions
+    T = model.transition_matrix()
+    pred = model.predecessors()
+    pred_T = pred.T.tocsr()
+    batch_size = batch_size or max(S // 8, 256)
+
+    V = np.zeros(S)
+    # priority[s] is an upper bound on the Bellman error of s
+    priority = np.abs(model.greedy_values(model.q_values(V, gamma)) - V)
+
+    backups = 0
+    deltas = []
+
+    while True:
+        pending = np.flatnonzero(priority >= theta)
+        if not pending.size:
+            break
+        if pending.size > batch_size:
+            pending = pending[np.argpartition(priority[pending], -batch_size)[-batch_size:]]
+        # Largest pending error per batch, for the convergence plot
+        deltas.append(float(priority[pending].max()))
+
+        # Large batches are cheaper to back up through whole-model products than to gather
+        dense = 4 * len(pending) >= S
+        if dense:
+            expected = (T @ V).reshape(S, A)[pending]
+        else:
+            pos, owner = _csr_gather(T.indptr, (pending[:, None] * A + np.arange(A)).ravel())
+            expected = np.bincount(owner, weights=T.data[pos] * V[T.indices[pos]], minlength=len(pending) * A).reshape(-1, A)
+        Q = np.where(model.mask[pending], model.R[pending] + gamma * expected, -np.inf)
+        V_new = np.where(model.has_actions[pending], Q.max(axis=1), 0.0)
+        change = np.abs(V_new - V[pending])
+        V[pending] = V_new
+        priority[pending] = 0.0
+        backups += len(pending)
+
+        # A change dV(s') adds gamma * max_a P(s' | s, a) * |dV(s')| to every predecessor s
+        if dense:
+            dV = np.zeros(S)
+            dV[pending] = change
+            priority += gamma * (pred_T @ dV)
+        else:
+            moved = np.flatnonzero(change > 0)
+            pos, owner = _csr_gather(pred.indptr, pending[moved])
+            priority += gamma * np.bincount(pred.indices[pos], weights=pred.data[pos] * change[moved][owner], minlength=S)
+
+    stats = {
+        'iterations': len(deltas),
+        'deltas': deltas,
+        'backups': backups
+    }
+
+    return V, stats
+
+def incremental_value_iteration_array(model, gamma: float, theta: float, V0: np.ndarray,
+                                      seeds: np.ndarray = None) -> Tuple[np.ndarray, Dict]:
+
+    # V0 is a converged solution of a slightly different model; only the seed states
+    # (all states if None) are checked, and changes spread through their predecessors
+    S, A = model.n_states, model.n_actions
+    T = model.transition_matrix()
+    pred = model.predecessors()
+
+    V = V0.copy()
+    # priority[s] is an upper bound on the Bellman error of s, as in prioritized sweeping
+    priority = np.zeros(S)
+    active = np.arange(S) if seeds is None else np.unique(np.asarray(seeds, dtype=np.int64))
+    priority[active] = np.inf
+
+    deltas = []
+    backups = 0
+
+    while True:
+        active = np.flatnonzero(priority >= theta)
+        if not active.size:
+            break
+
+        # Jacobi backup of every state whose error may still exceed theta
+        rows = (active[:, None] * A + np.arange(A)).ravel()
+        Q = np.where(model.mask[active], model.R[active] + gamma * (T[rows] @ V).reshape(-1, A), -np.inf)
+        V_new = np.where(model.has_actions[active], Q.max(axis=1), 0.0)
+        change = np.abs(V_new - V[active])
+        V[active] = V_new
+        priority[active] = 0.0
+        backups += len(active)
+        deltas.append(float(np.max(change, initial=0.0)))
+
+        moved = change > 0
+        if moved.any():
+            # The backup of a predecessor s moves by at most gamma times both the
+            # max_a P(s' | s, a)-weighted sum and the largest of its successors' changes
+            links = pred[active[moved]].tocoo()
+            weighted = np.bincount(links.col, weights=links.data * change[moved][links.row], minlength=S)
+            largest = np.zeros(S)
+            np.maximum.at(largest, links.col, change[moved][links.row])
+            priority += gamma * np.minimum(weighted, largest)
+
+    stats = {
+        'iterations': len(deltas),
+        'deltas': deltas,
+        'backups': backups
+    }
+
+    return V, stats
+
+def topological_value_iteration_array(model, gamma: float, theta: float) -> Tuple[np.ndarray, Dict]:
+
+    S, A = model.n_states, model.n_actions
+    T = model.transition_matrix()
+    succ = model.predecessors().T.tocsr()
+
+    n_comp, labels = csgraph.connected_components(succ, directed=True, connection='strong')
+    order = np.argsort(labels, kind='stable')
+    bounds = np.searchsorted(labels[order], np.arange(n_comp + 1))
+
+    # Condensation DAG: one edge per pair of distinct components, stored as predecessor lists
+    edges = succ.tocoo()
+    cross = labels[edges.row] != labels[edges.col]
+    cond = sp.csr_matrix((np.ones(cross.sum()), (labels[edges.col][cross], labels[edges.row][cross])),
+                         shape=(n_comp, n_comp))
+    cond.sum_duplicates()
+    out_degree = np.bincount(cond.indices, minlength=n_comp)
+    self_loop = succ.diagonal() > 0
+
+    V = np.zeros(S)
+    deltas = []
+    backups = 0
+
+    # Solve components in reverse topological order: every frontier only depends on solved states
+    frontier = np.flatnonzero(out_degree == 0)
+    while frontier.size:
+        states = np.concatenate([order[bounds[c]:bounds[c + 1]] for c in frontier])
+        rows = (states[:, None] * A + np.arange(A)).ravel()
+        T_f, R_f, mask_f, has_f = T[rows], model.R[states], model.mask[states], model.has_actions[states]
+        # Acyclic frontiers are exact after a single backward-induction backup
+        cyclic = len(states) > len(frontier) or self_loop[states].any()
+
+        while True:
+            Q = np.where(mask_f, R_f + gamma * (T_f @ V).reshape(-1, A), -np.inf)
+            V_new = np.where(has_f, Q.max(axis=1), 0.0)
+            delta = float(np.max(np.abs(V_new - V[states]), initial=0.0))
+            V[states] = V_new
+            backups += len(states)
+            deltas.append(delta)
+            if not cyclic or delta < theta:
+                break
+
+        preds = cond[frontier].indices
+        np.subtract.at(out_degree, preds, 1)
+        preds = np.unique(preds)
+        frontier = preds[out_degree[preds] == 0]
+
+    stats = {
+        'iterations': len(deltas),
+        'deltas': deltas,
+        'backups': backups,
+        'components': n_comp
+    }
+
+    return V, stats
+
+def bounded_value_iteration_array(model, gamma: float, theta: float) -> Tuple[np.ndarray, Dict]:
+
+    S, A = model.n_states, model.n_actions
+    T = model.P if model.is_sparse else model.P.reshape(S * A, S)
+    R = model.R.ravel()
+    # MacQueen bounds: V_k + c * min(V_k - V_k-1) <= V* <= V_k + c * max(V_k - V_k-1)
+    c = gamma / (1 - gamma) if gamma < 1 else None
+
+    alive = model.mask.ravel().copy()
+    rows = np.flatnonzero(alive)
+    T_rows, R_rows, row_state = T[rows], R[rows], rows // A
+
+    V = np.zeros(S)
+    hi_prev = lo_prev = None
+    iteration = 0
+    deltas, spans = [], []
+    action_backups = 0
+
+    while True:
+        iteration += 1
+        Q_rows = np.where(alive[rows], R_rows + gamma * (T_rows @ V), -np.inf)
+        action_backups += len(rows)
+
+        Q = np.full(S * A, -np.inf)
+        Q[rows] = Q_rows
+        V_new = np.where(model.has_actions, Q.reshape(S, A).max(axis=1), 0.0)
+        diff = V_new - V
+        lo, hi = (float(diff.min()), float(diff.max())) if S else (0.0, 0.0)
+        deltas.append(float(np.max(np.abs(diff), initial=0.0)))
+        spans.append(hi - lo)
+
+        if c is not None and hi_prev is not None:
+            # An action whose optimistic Q value is below the state's pessimistic value is never optimal
+            lower = np.maximum(V + c * lo_prev, V_new + c * lo)[row_state]
+            upper = Q_rows + gamma * c * hi_prev
+            drop = alive[rows] & (upper < lower - 1e-9 * (1.0 + np.abs(lower)))
+            if drop.any():
+                alive[rows[drop]] = False
+                # Re-slice the transition rows only once enough of them are dead
+                if np.count_nonzero(alive) < 0.9 * len(rows):
+                    rows = np.flatnonzero(alive)
+                    T_rows, R_rows, row_state = T[rows], R[rows], rows // A
+
+        V, lo_prev, hi_prev = V_new, lo, hi
+
+        # Span stopping with the guarantee of the sup-norm test delta < theta: the greedy
+        # policy is 2 * c * theta-optimal once span < 2 * theta, and span <= 2 * delta
+        if spans[-1] < 2 * theta:
+            break
+
+    if c is not None:
+        # The midpoint of the MacQueen bounds is within c * span / 2 < c * theta of V*
+        V = np.where(model.has_actions, V + c * (lo + hi) / 2, 0.0)
+
+    n_available = int(model.mask.sum())
+
+    stats = {
+        'iterations': iteration,
+        'deltas': deltas,
+        'spans': spans,
+        'backups': iteration * S,
+        'action_backups': action_backups,
+        'action_backups_saved': iteration * n_available - action_backups,
+        'eliminated_actions': n_available - int(np.count_nonzero(alive))
+    }
+
+    return V, stats
+
+# Worker-side views of the shared model, set up once per process by _attach_shared
+_shared = {}
+
+def _attach_shared(specs: Dict, n_states: int, n_actions: int, gamma: float):
+    for name, (shm_name, shape, dtype) in specs.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _shared[name] = (shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf))
+    _shared['meta'] = (n_states, n_actions, gamma)
+
+def _sweep_block(task: Tuple[int, int, int]) -> float:
+    lo, hi, parity = task
+    S, A, gamma = _shared['meta']
+    indptr = _shared['indptr'][1]
+    start, end = indptr[lo * A], indptr[hi * A]
+    # Zero-copy CSR view over this block's transition rows
+    T = sp.csr_matrix((_shared['data'][1][start:end], _shared['indices'][1][start:end],
+                       indptr[lo * A:hi * A + 1] - start), shape=((hi - lo) * A, S), copy=False)
+    V, V_next = _shared['V'][1][parity], _shared['V'][1][1 - parity]
+
+    Q = np.where(_shared['mask'][1][lo:hi], _shared['R'][1][lo:hi] + gamma * (T @ V).reshape(-1, A), -np.inf)
+    V_next[lo:hi] = np.where(_shared['has_actions'][1][lo:hi], Q.max(axis=1), 0.0)
+    return float(np.max(np.abs(V_next[lo:hi] - V[lo:hi]), initial=0.0))
+
+def parallel_value_iteration_array(model, gamma: float, theta: float, n_workers: int = None) -> Tuple[np.ndarray, Dict]:
+
+    S, A = model.n_states, model.n_actions
+    n_workers = min(n_workers or os.cpu_count() or 1, S)
+    if n_workers <= 1:
+        return value_iteration_array(model, gamma, theta)
+
+    T = model.transition_matrix()
+    arrays = {
+        'data': T.data, 'indices': T.indices, 'indptr': T.indptr,
+        'R': model.R, 'mask': model.mask, 'has_actions': model.has_actions,
+        # Jacobi double buffer: sweep k reads V[k % 2] and writes V[1 - k % 2]
+        'V': np.zeros((2, S))
+    }
+
+    blocks = {}
+    try:
+        for name, array in arrays.items():
+            shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            blocks[name] = shm
+            np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+        specs = {name: (blocks[name].name, a.shape, a.dtype) for name, a in arrays.items()}
+        V_shared = np.ndarray((2, S), dtype=float, buffer=blocks['V'].buf)
+
+        # Contiguous partitions keep each worker's CSR slice in one piece
+        bounds = np.linspace(0, S, n_workers + 1).astype(int)
+        iteration = 0
+        deltas = []
+
+        with Pool(n_workers, initializer=_attach_shared, initargs=(specs, S, A, gamma)) as pool:
+            while True:
+                parity = iteration % 2
+                tasks = [(int(lo), int(hi), parity) for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo]
+                delta = max(pool.map(_sweep_block, tasks))
+                iteration += 1
+                deltas.append(delta)
+
+                if delta < theta:
+                    break
+
+        V = V_shared[iteration % 2].copy()
+    finally:
+        for shm in blocks.values():
+            shm.close()
+            shm.unlink()
+
+    stats = {
+        'iterations': iteration,
+        'deltas': deltas,
+        'backups': iteration * S,
+        'workers': n_workers
+    }
+
+    return V, stats
+
+def extract_policy_array(model, V: np.ndarray, gamma: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+
+    Q = model.q_values(V, gamma)
+    policy = np.argmax(Q, axis=1)
+
+    # Action gap: margin of the greedy action over the runner-up, NaN with fewer than two actions
+    gaps = np.full(model.n_states, np.nan)
+    if model.n_actions > 1:
+        top2 = np.partition(Q, model.n_actions - 2, axis=1)[:, -2:]
+        with np.errstate(invalid='ignore'):
+            gaps = np.where(model.mask.sum(axis=1) >= 2, top2[:, 1] - top2[:, 0], np.nan)
+
+    return Q, policy, gaps
+
+def action_gap_stats(gaps: np.ndarray) -> Dict:
+
+    gaps = gaps[~np.isnan(gaps)]
+    if not gaps.size:
+        return {}
+
+    return {
+        'action_gap_mean': float(np.mean(gaps)),
+        'action_gap_min': float(np.min(gaps)),
+        'tied_states': int(np.sum(gaps < 1e-9))
+    }
+
+def policy_evaluation_array(policy: np.ndarray, model, gamma: float, theta: float, method: str = "iterative", V0: np.ndarray = None) -> np.ndarray:
+
+    if method not in EVALUATION_METHODS:
+        raise ValueError(f"Unknown evaluation method: {method}")
+
+    P_pi, r_pi = model.policy_model(policy)
+
+    if method != "iterative":
+        V = solve_policy_values(P_pi, r_pi, gamma, theta, method, V0)
+        # (I - gamma * P_pi) is singular for gamma = 1 with recurrent states; sweep instead
+        if V is not None and np.all(np.isfinite(V)):
+            return V
+
+    V = np.zeros(model.n_states) if V0 is None else V0.copy()
+
+    while True:
+        V_new = r_pi + gamma * (P_pi @ V)
+        delta = float(np.max(np.abs(V_new - V), initial=0.0))
+        V = V_new
+        if delta < theta:
+            break
+    return V
+
+def solve_policy_values(P_pi, r_pi: np.ndarray, gamma: float, theta: float, method: str = "direct", V0: np.ndarray = None):
+
+    n = len(r_pi)
+
+    if not sp.issparse(P_pi):
+        A = np.eye(n) - gamma * P_pi
+        if method == "direct":
+            try:
+                return np.linalg.solve(A, r_pi)
+            except np.linalg.LinAlgError:
+                return None
+        A = sp.csr_matrix(A)
+    else:
+        A = (sp.identity(n, format='csr') - gamma * P_pi).tocsr()
+
+    with warnings.catch_warnings(), np.errstate(all='ignore'):
+        warnings.simplefilter('ignore', spla.MatrixRankWarning)
+        if method == "direct":
+            return spla.spsolve(A.tocsc(), r_pi)
+
+        # Incomplete-LU preconditioning keeps Krylov iterations low on near-deterministic chains
+        try:
+            ilu = spla.spilu(A.tocsc())
+            M = spla.LinearOperator(A.shape, ilu.solve)
+        except RuntimeError:
+            M = None
+        solver = spla.gmres if method == "gmres" else spla.bicgstab
+        atol = theta * (1 - gamma) if gamma < 1 else theta
+        # Zero relative tolerance so theta alone sets the accuracy; SciPy < 1.12 calls it tol
+        try:
+            V, info = solver(A, r_pi, x0=V0, M=M, atol=atol, rtol=0.0)
+        except TypeError:
+            V, info = solver(A, r_pi, x0=V0, M=M, atol=atol, tol=0.0)
+    return V if info == 0 else None
+
+def policy_iteration_array(model, gamma: float, theta: float, eval_method: str = "iterative") -> Tuple[np.ndarray, np.ndarray, Dict]:
+
+    states = np.arange(model.n_states)
+    policy = np.argmax(np.where(model.mask, np.random.rand(model.n_states, model.n_actions), -1.0), axis=1)
+
+    V = None
+    iteration = 0
+    deltas = []
+    iteration_times = []
+
+    while True:
+        iteration += 1
+        tick = time.perf_counter()
+
+        # Warm-start from the previous policy's values; they are close once the policy settles
+        V = policy_evaluation_array(model.deterministic_policy(policy), model, gamma, theta, eval_method, V)
+
+        Q = model.q_values(V, gamma)
+        best_action = np.argmax(Q, axis=1)
+        old_value = Q[states, policy]
+        best_value = Q[states, best_action]
+
+        # Keep the current action on ties so the loop cannot cycle between equal actions
+        improved = model.has_actions & (best_value > old_value + 1e-12)
+        max_delta = float(np.max(np.where(improved, best_value - old_value, 0.0), initial=0.0))
+
+        policy = np.where(improved, best_action, policy)
+
+        deltas.append(max_delta)
+        iteration_times.append(time.perf_counter() - tick)
+
+        if not improved.any():
+            break
+
+    stats = {
+        'iterations': iteration,
+        'deltas': deltas,
+        'iteration_times': iteration_times
+    }
+
+    return V, policy, stats
+
+def modified_policy_iteration_array(model, gamma: float, theta: float, sweeps=5, max_sweeps: int = 100) -> Tuple[np.ndarray, np.ndarray, Dict]:
+
+    # sweeps: evaluation sweeps per improvement, or "adaptive" to sweep until the
+    # evaluation change drops below a tenth of the current Bellman residual
+    adaptive = sweeps == "adaptive"
+    limit = max_sweeps if adaptive else max(1, int(sweeps))
+
+    states = np.arange(model.n_states)
+    V = np.zeros(model.n_states)
+    policy = None
+
+    iteration = 0
+    deltas = []
+    iteration_times = []
+    eval_sweeps = []
+
+    while True:
+        iteration += 1
+        tick = time.perf_counter()
+
+        Q = model.q_values(V, gamma)
+        best_action = np.argmax(Q, axis=1)
+        if policy is None:
+            policy = best_action
+        else:
+            improved = model.has_actions & (Q[states, best_action] > Q[states, policy] + 1e-12)
+            policy = np.where(improved, best_action, policy)
+
+        # The greedy backup is the first evaluation sweep of the new policy
+        V_new = model.greedy_values(Q)
+        residual = float(np.max(np.abs(V_new - V), initial=0.0))
+        V = V_new
+        deltas.append(residual)
+
+        if residual < theta:
+            iteration_times.append(time.perf_counter() - tick)
+            eval_sweeps.append(1)
+            break
+
+        P_pi, r_pi = model.policy_model(model.deterministic_policy(policy))
+        k = 1
+        while k < limit:
+            V_new = r_pi + gamma * (P_pi @ V)
+            change = float(np.max(np.abs(V_new - V), initial=0.0))
+            V = V_new
+            k += 1
+            if adaptive and change < max(theta, 0.1 * residual):
+                break
+
+        iteration_times.append(time.perf_counter() - tick)
+        eval_sweeps.append(k)
+
+    stats = {
+        'iterations': iteration,
+        'deltas': deltas,
+        'iteration_times': iteration_times,
+        'eval_sweeps': eval_sweeps
+    }
+
+    return V, policy, stats
@@ -0,0 +1,48 @@
+"""Exploration noise - block-drawn random numbers for epsilon-greedy action selection"""
+from typing import Optional
+import numpy as np
+
+DEFAULT_BLOCK_SIZE = 4096
+
+
+class ExplorationNoise:
+    """Uniform samples and random actions pre-drawn in blocks from one seeded Generator
+
+    Drawing a block at a time removes the per-step cost of calling into the RNG,
+    and a single Generator makes a run reproducible from its seed.
+    """
+
+    def __init__(self, n_actions: int, seed: Optional[int] = None, block_size: int = DEFAULT_BLOCK_SIZE):
+        self.n_actions = n_actions
+        self.block_size = block_size
+        self.rng = np.random.default_rng(seed)
+        self._uniforms = iter(())
+        self._actions = iter(())
+
+    def uniform(self) -> float:
+        u = next(self._uniforms, None)
+        if u is None:
+            self._uniforms = iter(self.rng.random(self.block_size).tolist())
+            u = next(self._uniforms)
+        return u
+
+    def action(self) -> int:
+        a = next(self._actions, None)
+        if a is None:
+            self._actions = iter(self.rng.integers(self.n_actions, size=self.block_size).tolist())
+            a = next(self._actions)
+        return a
+
+    def actions(self, size: int) -> np.ndarray:
+        """A fresh array of uniformly random actions, e.g. for an initial policy"""
+        return self.rng.integers(self.n_actions, size=size)
+
+    def epsilon_greedy(self, Q_values: np.ndarray, epsilon: float) -> int:
+        return self.action() if self.uniform() < epsilon else int(Q_values.argmax())
+
+    def epsilon_greedy_batch(self, Q_rows: np.ndarray, epsilon: float) -> np.ndarray:
+        """One epsilon-greedy action per row of Q_rows"""
+        actions = Q_rows.argmax(axis=1)
+        explore = self.rng.random(len(actions)) < epsilon
+        actions[explore] = self.rng.integers(self.n_actions, size=int(np.count_nonzero(explore)))
+        return actions
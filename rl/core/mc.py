@@ -1,22 +1,36 @@
-import random
 from typing import List, Callable, Tuple, Dict
 import numpy as np
+from scipy.signal import lfilter
+from rl.core.exploration import ExplorationNoise
+
+# Episodes at least this long are updated with array operations
+VECTORIZE_MIN_LENGTH = 48
+
+
+def discounted_returns(rewards, gamma: float) -> np.ndarray:
+    # G_t = r_t + gamma * G_{t+1} as a linear recurrence run over the reversed rewards
+    return lfilter([1.0], [1.0, -gamma], np.asarray(rewards, dtype=float)[::-1])[::-1]
 
 def monte_carlo(state_space: List[int], actions: List[int], generate_episode: Callable, 
                 episodes: int = 1000, gamma: float = 1.0, type: str = "FV", 
-                fixed_alpha: bool = False, alpha: float = 0.1) -> Tuple[Dict, Dict, Dict]:
-
-    returns_sum = {}
-    returns_count = {}
-    Q = {}
+                fixed_alpha: bool = False, alpha: float = 0.1, Q: np.ndarray = None,
+                noise: ExplorationNoise = None) -> Tuple[np.ndarray, np.ndarray, Dict]:
 
-    for s in state_space:
-        for a in actions:
-            Q[(s, a)] = 0
-            returns_sum[(s, a)] = 0
-            returns_count[(s, a)] = 0
+    # States and actions index the rows and columns of Q, which is updated in place when given
+    shape = (len(state_space), len(actions))
+    if Q is None:
+        Q = np.zeros(shape)
+    n_actions = shape[1]
+    # Flat views indexed by s * n_actions + a
+    Q_flat = Q.reshape(-1)
+    returns_sum = np.zeros(shape[0] * n_actions)
+    returns_count = np.zeros(shape[0] * n_actions)
 
-    policy = {s: random.choice(actions) for s in state_space}
+    if noise is None:
+        noise = ExplorationNoise(len(actions))
+    policy = noise.actions(len(state_space))
+    # Greedy actions kept current by re-scoring only the rows updated in an episode
+    greedy = np.argmax(Q, axis=1)
     episode_rewards = []
     episode_lengths = []
 
@@ -26,31 +40,47 @@ def monte_carlo(state_space: List[int], actions: List[int], generate_episode: Ca
         episode_rewards.append(sum(rewards))
         episode_lengths.append(len(actions_taken))
 
-        G = 0
-        visited = set()
-
-        for t in reversed(range(len(actions_taken))):
-            sa = (states[t], actions_taken[t])
-            G = rewards[t + 1] + gamma * G
-            if not fixed_alpha:
-                if type == "FV":
-                    if sa not in visited:
-                        visited.add(sa)
-                        returns_sum[sa] += G
-                        returns_count[sa] += 1
-                        Q[sa] = returns_sum[sa] / returns_count[sa]
-                elif type == "EV":
+        if len(actions_taken) < VECTORIZE_MIN_LENGTH:
+            # Array calls cost more than they save on short episodes
+            G = 0.0
+            returns = []
+            for t in reversed(range(len(actions_taken))):
+                G = rewards[t + 1] + gamma * G
+                returns.append((states[t] * n_actions + actions_taken[t], G))
+            if type == "FV":
+                # Later entries overwrite earlier ones, leaving the return of the earliest visit
+                returns = dict(returns).items()
+            for sa, G in returns:
+                if not fixed_alpha:
                     returns_sum[sa] += G
                     returns_count[sa] += 1
-                    Q[sa] = returns_sum[sa] / returns_count[sa]
+                    Q_flat[sa] = returns_sum[sa] / returns_count[sa]
+                else:
+                    Q_flat[sa] += alpha * (G - Q_flat[sa])
+        else:
+            sa = np.asarray(states[:-1]) * n_actions + np.asarray(actions_taken)
+            G = discounted_returns(rewards[1:], gamma)
+            if type == "FV":
+                # Keep the return from the earliest visit of each (s, a) pair
+                sa, first = np.unique(sa, return_index=True)
+                G = G[first]
+            if not fixed_alpha:
+                np.add.at(returns_sum, sa, G)
+                np.add.at(returns_count, sa, 1)
+                Q_flat[sa] = returns_sum[sa] / returns_count[sa]
+            elif type == "FV":
+                Q_flat[sa] += alpha * (G - Q_flat[sa])
             else:
-                if type == "FV":
-                    if sa not in visited:
-                        visited.add(sa)
-                        Q[sa] += alpha * (G - Q[sa])
-                elif type == "EV":
-                    Q[sa] += alpha * (G - Q[sa])
-        for s in state_space:
-            policy[s] = max(actions, key=lambda a: Q[(s, a)])
+                # k successive updates Q += alpha * (G_i - Q), made from the last visit back to
+                # the first, sum to (1 - alpha)^k Q + sum_i alpha (1 - alpha)^(visits before i) G_i
+                order = np.argsort(sa, kind='stable')
+                pairs, start, counts = np.unique(sa[order], return_index=True, return_counts=True)
+                earlier = np.arange(len(order)) - np.repeat(start, counts)
+                weighted = np.zeros(len(pairs))
+                np.add.at(weighted, np.repeat(np.arange(len(pairs)), counts), alpha * (1 - alpha) ** earlier * G[order])
+                Q_flat[pairs] = (1 - alpha) ** counts * Q_flat[pairs] + weighted
+        dirty = states[:-1]
+        greedy[dirty] = Q[dirty].argmax(axis=1)
+        policy = greedy
    
     return Q, policy, {'episode_rewards': episode_rewards, 'episode_lengths': episode_lengths}
@@ -0,0 +1,225 @@
+"""Array-backed MDP models for the dynamic programming solvers"""
+from typing import Dict, Optional
+import numpy as np
+from scipy import sparse as sp
+
+# Models sparser than this are stored as CSR when the format is chosen automatically
+SPARSE_DENSITY = 0.05
+
+
+class TabularMDP:
+    """Finite MDP stored as transition probabilities P and expected rewards R[s, a]
+
+    P is either a dense (S, A, S) tensor or a CSR matrix of shape (S * A, S) with
+    one row per (s, a) pair at row index s * A + a. `mask[s, a]` marks the actions
+    available in each state; states without any available action keep a value
+    of 0, as in `dp.bellman_equation`.
+
+    A pruned model only holds a subset of the environment's states: model index i
+    stands for environment state `states[i]`, and `expand` maps per-state results
+    back onto all `n_env_states` environment states.
+    """
+
+    def __init__(self, P, R, mask=None, states=None, n_env_states=None):
+        self.P = P
+        self.R = np.asarray(R, dtype=float)
+        self.n_states, self.n_actions = self.R.shape
+        self.mask = np.ones(self.R.shape, dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+        self.has_actions = self.mask.any(axis=1)
+        self.is_sparse = sp.issparse(P)
+        self.is_pruned = states is not None
+        self.states = np.arange(self.n_states) if states is None else np.asarray(states, dtype=np.int64)
+        self.n_env_states = self.n_states if n_env_states is None else n_env_states
+
+    def expand(self, values, fill=0.0):
+        """Scatter a per-state array onto the full environment state space"""
+        if not self.is_pruned:
+            return values
+        full = np.full((self.n_env_states,) + values.shape[1:], fill, dtype=values.dtype)
+        full[self.states] = values
+        return full
+
+    def model_indices(self, env_states):
+        """Model index of each environment state, -1 for states a pruned model left out"""
+        index = np.full(self.n_env_states, -1, dtype=np.int64)
+        index[self.states] = np.arange(self.n_states)
+        return index[np.asarray(env_states, dtype=np.int64)]
+
+    def expected_values(self, V):
+        """Return E[V(s') | s, a] for every (s, a) as an (S, A) array"""
+        if self.is_sparse:
+            return (self.P @ V).reshape(self.n_states, self.n_actions)
+        return self.P @ V
+
+    def q_values(self, V, gamma):
+        """One-step lookahead Q(s, a) = R(s, a) + gamma * E[V(s')], -inf for unavailable actions"""
+        Q = self.R + gamma * self.expected_values(V)
+        return np.where(self.mask, Q, -np.inf)
+
+    def greedy_values(self, Q):
+        """Row-wise max of Q, 0 for states without actions"""
+        return np.where(self.has_actions, Q.max(axis=1), 0.0)
+
+    def policy_model(self, policy):
+        """Return (P_pi, r_pi) for a stochastic policy given as an (S, A) matrix"""
+        policy = np.where(self.mask, policy, 0.0)
+        if self.is_sparse:
+            rows = np.repeat(np.arange(self.n_states), self.n_actions)
+            cols = np.arange(self.n_states * self.n_actions)
+            weights = sp.csr_matrix((policy.ravel(), (rows, cols)),
+                                    shape=(self.n_states, self.n_states * self.n_actions))
+            P_pi = (weights @ self.P).tocsr()
+        else:
+            P_pi = np.einsum('sa,sat->st', policy, self.P)
+        r_pi = np.sum(policy * self.R, axis=1)
+        return P_pi, r_pi
+
+    def transition_matrix(self):
+        """Transitions as a CSR matrix of shape (S * A, S), regardless of storage"""
+        if self.is_sparse:
+            return self.P
+        return sp.csr_matrix(self.P.reshape(self.n_states * self.n_actions, self.n_states))
+
+    def predecessors(self):
+        """CSR matrix whose row s' lists the predecessors s of s' in its column indices
+
+        The stored weight is max_a P(s' | s, a), the largest influence a change
+        in V(s') can have on the Bellman backup of s.
+        """
+        T = self.transition_matrix().tocoo()
+        keep = T.data > 0
+        succ, pred = T.col[keep].astype(np.int64), T.row[keep] // self.n_actions
+        key = succ * self.n_states + pred
+        order = np.argsort(key, kind='stable')
+        key, start = np.unique(key[order], return_index=True)
+        weight = np.maximum.reduceat(T.data[keep][order], start) if len(start) else np.zeros(0)
+        return sp.csr_matrix((weight, (key // self.n_states, key % self.n_states)),
+                             shape=(self.n_states, self.n_states))
+
+    def aggregate(self, groups, n_groups: int):
+        """Coarse model over state groups with transitions and rewards averaged within each group
+
+        groups[s] is the group of model state s. An action is available in a group
+        if any member allows it, and only those members contribute to its average.
+        """
+        A = self.n_actions
+        counts = np.zeros((n_groups, A))
+        np.add.at(counts, groups, self.mask)
+        weight = self.mask / np.maximum(counts, 1)[groups]
+
+        R = np.zeros((n_groups, A))
+        np.add.at(R, groups, weight * self.R)
+
+        T = self.transition_matrix().tocoo()
+        rows = groups[T.row // A] * A + T.row % A
+        data = T.data * weight.ravel()[T.row]
+        P = sp.csr_matrix((data, (rows, groups[T.col])), shape=(n_groups * A, n_groups))
+        P.sum_duplicates()
+        return TabularMDP(P, R, counts > 0)
+
+    def predecessor_states(self, env_states):
+        """Environment states with a transition into any of env_states"""
+        index = self.model_indices(env_states)
+        return self.states[self.predecessors()[index[index >= 0]].indices]
+
+    def deterministic_policy(self, actions):
+        """Convert an action-per-state array into an (S, A) policy matrix"""
+        policy = np.zeros((self.n_states, self.n_actions))
+        policy[np.arange(self.n_states), actions] = 1.0
+        return policy
+
+    def uniform_policy(self):
+        """Equiprobable policy over the available actions of each state"""
+        counts = np.maximum(self.mask.sum(axis=1, keepdims=True), 1)
+        return self.mask / counts
+
+
+def from_transitions(rows, next_states, probs, rewards, n_states: int, n_actions: int,
+                     mask=None, sparse: Optional[bool] = None, states=None,
+                     n_env_states: Optional[int] = None) -> TabularMDP:
+    """Assemble a model from flat transition lists
+
+    Entry i moves (s, a) = divmod(rows[i], n_actions) to next_states[i] with
+    probability probs[i] and reward rewards[i]; duplicates are summed. With
+    sparse=None the storage format is chosen from the model density.
+    """
+
+    rows = np.asarray(rows, dtype=np.int64)
+    next_states = np.asarray(next_states, dtype=np.int64)
+    probs = np.asarray(probs, dtype=float)
+
+    R_sa = np.bincount(rows, weights=probs * np.asarray(rewards, dtype=float),
+                       minlength=n_states * n_actions).reshape(n_states, n_actions)
+
+    if sparse is None:
+        sparse = len(probs) < SPARSE_DENSITY * n_states * n_actions * n_states
+
+    if sparse:
+        P = sp.csr_matrix((probs, (rows, next_states)), shape=(n_states * n_actions, n_states))
+        P.sum_duplicates()
+    else:
+        P = np.zeros((n_states * n_actions, n_states))
+        np.add.at(P, (rows, next_states), probs)
+        P = P.reshape(n_states, n_actions, n_states)
+
+    return TabularMDP(P, R_sa, mask, states, n_env_states)
+
+
+def from_dicts(P: Dict, R: Dict, n_states: int, n_actions: int, sparse: Optional[bool] = None) -> TabularMDP:
+    """Convert the nested P[s][a][s'] / R[s][a][s'] dicts used by `rl.core.dp`"""
+
+    rows, next_states, probs, rewards = [], [], [], []
+    mask = np.zeros((n_states, n_actions), dtype=bool)
+
+    for s, actions in P.items():
+        for a, successors in actions.items():
+            mask[s, a] = True
+            for ns, prob in successors.items():
+                rows.append(s * n_actions + a)
+                next_states.append(ns)
+                probs.append(prob)
+                rewards.append(R[s][a].get(ns, 0.0))
+
+    return from_transitions(rows, next_states, probs, rewards, n_states, n_actions, mask, sparse)
+
+
+def from_env(env, n_states: int, n_actions: int, sparse: Optional[bool] = None,
+             start_states=None) -> TabularMDP:
+    """Build a model from `env.get_transition_model()`
+
+    Without start_states every state in range(n_states) is kept. Otherwise the
+    model is pruned to the states reachable from start_states, numbered in
+    breadth-first discovery order.
+
+    Raises NotImplementedError if the environment is not model-based.
+    """
+
+    next_states, probs, rewards, _ = env.get_transition_model()
+    k = next_states.shape[2]
+    rows = np.repeat(np.arange(n_states * n_actions), k)
+    next_states, probs, rewards = next_states.ravel(), probs.ravel(), rewards.ravel()
+    keep = probs > 0
+    rows, next_states, probs, rewards = rows[keep], next_states[keep], probs[keep], rewards[keep]
+
+    if start_states is None:
+        return from_transitions(rows, next_states, probs, rewards, n_states, n_actions, sparse=sparse)
+
+    successors = sp.csr_matrix((np.ones(len(rows)), (rows // n_actions, next_states)), shape=(n_states, n_states))
+    frontier = np.unique(np.asarray(list(start_states), dtype=np.int64))
+    visited = np.zeros(n_states, dtype=bool)
+    visited[frontier] = True
+    order = [frontier]
+    while frontier.size:
+        reached = np.unique(successors[frontier].indices)
+        frontier = reached[~visited[reached]]
+        visited[frontier] = True
+        order.append(frontier)
+
+    states = np.concatenate(order)
+    index = np.full(n_states, -1, dtype=np.int64)
+    index[states] = np.arange(len(states))
+
+    keep = visited[rows // n_actions]
+    rows = index[rows[keep] // n_actions] * n_actions + rows[keep] % n_actions
+    return from_transitions(rows, index[next_states[keep]], probs[keep], rewards[keep], len(states), n_actions,
+                            sparse=sparse, states=states, n_env_states=n_states)
@@ -0,0 +1,96 @@
+from typing import Dict, Tuple
+import numpy as np
+
+# The 8 symmetries of the 3x3 board as cell permutations: new_board[i] = board[perm[i]]
+_GRID = np.arange(9).reshape(3, 3)
+SYMMETRIES = [tuple(np.rot90(g, k).ravel()) for g in (_GRID, _GRID.T) for k in range(4)]
+
+LINES = [(0, 1, 2), (3, 4, 5), (6, 7, 8), (0, 3, 6), (1, 4, 7), (2, 5, 8), (0, 4, 8), (2, 4, 6)]
+
+# Rewards of TicTacToeEnv, from the point of view of player 1
+WIN, LOSS, DRAW, INVALID = 1.0, -1.0, 0.5, -1.0
+
+
+def canonical(board: Tuple) -> Tuple:
+    return min(tuple(board[i] for i in perm) for perm in SYMMETRIES)
+
+def winner(board: Tuple):
+    for a, b, c in LINES:
+        if board[a] != 0 and board[a] == board[b] == board[c]:
+            return board[a]
+    return 0 if 0 not in board else None
+
+def encode(board: Tuple) -> int:
+    # Same numbering as TicTacToeEnv._get_state: cell i contributes 3^i, with -1 stored as 2
+    return sum((2 if v == -1 else v) * 3 ** i for i, v in enumerate(board))
+
+def solve_tictactoe(gamma: float = 0.99, opponent: str = "random") -> Tuple[Dict, Dict, Dict]:
+
+    # Player 1 (the agent) maximizes; player -1 either moves uniformly at random,
+    # like the environment, or adversarially ("minimax")
+    if opponent not in ("random", "minimax"):
+        raise ValueError(f"Unknown opponent: {opponent}")
+
+    table = {}
+    values = {}
+
+    def q_value(board, a):
+        after = board[:a] + (1,) + board[a + 1:]
+        result = winner(after)
+        if result is not None:
+            return WIN if result == 1 else DRAW
+
+        outcomes = []
+        for b in range(9):
+            if after[b] != 0:
+                continue
+            reply = after[:b] + (-1,) + after[b + 1:]
+            result = winner(reply)
+            if result is not None:
+                outcomes.append(LOSS if result == -1 else DRAW)
+            else:
+                outcomes.append(gamma * value(reply))
+        return min(outcomes) if opponent == "minimax" else sum(outcomes) / len(outcomes)
+
+    def value(board):
+        # Transposition table over symmetry classes of positions with player 1 to move,
+        # fronted by a per-board cache so each board is canonicalized only once
+        if board not in values:
+            key = canonical(board)
+            if key not in table:
+                table[key] = max(q_value(board, a) for a in range(9) if board[a] == 0)
+            values[board] = table[key]
+        return values[board]
+
+    # Q rows for every reachable position with player 1 to move, keyed by env state
+    Q = {}
+    stack, seen = [(0,) * 9], set()
+    while stack:
+        board = stack.pop()
+        state = encode(board)
+        if state in seen:
+            continue
+        seen.add(state)
+
+        v = value(board)
+        # An occupied cell costs the invalid-move penalty and leaves the board unchanged
+        Q[state] = [q_value(board, a) if board[a] == 0 else INVALID + gamma * v for a in range(9)]
+
+        for a in range(9):
+            if board[a] != 0:
+                continue
+            after = board[:a] + (1,) + board[a + 1:]
+            if winner(after) is not None:
+                continue
+            for b in range(9):
+                if after[b] == 0:
+                    reply = after[:b] + (-1,) + after[b + 1:]
+                    if winner(reply) is None:
+                        stack.append(reply)
+
+    stats = {
+        'positions': len(Q),
+        'canonical_positions': len(table)
+    }
+
+    return Q, {s: int(np.argmax(q)) for s, q in Q.items()}, stats
@@ -0,0 +1,147 @@
+"""Model Cache - Persistent on-disk storage for built MDP models"""
+import hashlib
+import os
+from typing import Optional
+import numpy as np
+from scipy import sparse as sp
+
+from rl.core import mdp
+
+# Bump when the stored layout changes so stale entries are never loaded
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'rl-workbench', 'models')
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+class ModelCache:
+    """Content-addressed store of TabularMDP models as .npz files with LRU eviction
+
+    Entries are keyed on a hash of the environment's model key and the build
+    options. The file modification time records the last use; once the total
+    size exceeds max_bytes the least recently used entries are removed.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory or os.environ.get('RL_MODEL_CACHE', DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        return hashlib.sha1(repr((CACHE_VERSION,) + parts).encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def get(self, key):
+        """Return the cached model for key, or None"""
+        path = self._path(key)
+        try:
+            with np.load(path) as data:
+                model = self._unpack(data)
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Truncated or foreign files raise anything from BadZipFile to EOFError; treat
+            # them as a miss and drop the entry so the rebuilt model replaces it
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return model
+
+    def put(self, key, model):
+        """Store a model under key and evict old entries if over budget"""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(key)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, **self._pack(model))
+            os.replace(tmp_path, path)
+            self.evict()
+        except OSError:
+            # A read-only or full disk only costs us the cache
+            pass
+
+    def evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.npz'):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.directory, name))
+            total -= size
+
+    def clear(self):
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name.endswith('.npz'):
+                    os.remove(os.path.join(self.directory, name))
+
+    @staticmethod
+    def _pack(model):
+        arrays = {
+            'R': model.R,
+            'mask': model.mask,
+            'states': model.states,
+            'meta': np.array([model.n_env_states, int(model.is_pruned), int(model.is_sparse)])
+        }
+        if model.is_sparse:
+            arrays.update(P_data=model.P.data, P_indices=model.P.indices, P_indptr=model.P.indptr)
+        else:
+            arrays['P'] = model.P
+        return arrays
+
+    @staticmethod
+    def _unpack(data):
+        R = data['R']
+        n_states, n_actions = R.shape
+        n_env_states, is_pruned, is_sparse = (int(v) for v in data['meta'])
+
+        if is_sparse:
+            P = sp.csr_matrix((data['P_data'], data['P_indices'], data['P_indptr']),
+                              shape=(n_states * n_actions, n_states))
+        else:
+            P = data['P']
+
+        states = data['states'] if is_pruned else None
+        return mdp.TabularMDP(P, R, data['mask'], states, n_env_states if is_pruned else None)
+
+
+_default_cache = None
+
+
+def get_default_cache() -> ModelCache:
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ModelCache()
+    return _default_cache
+
+
+def cached_from_env(env, n_states: int, n_actions: int, sparse: Optional[bool] = None,
+                    start_states=None, cache: Optional[ModelCache] = None):
+    """`mdp.from_env` backed by the model cache
+
+    Environments whose `get_model_key()` returns None are always rebuilt.
+    """
+
+    env_key = env.get_model_key()
+    if env_key is None:
+        return mdp.from_env(env, n_states, n_actions, sparse=sparse, start_states=start_states)
+
+    cache = cache or get_default_cache()
+    roots = None if start_states is None else tuple(sorted(int(s) for s in start_states))
+    key = cache.make_key(env_key, n_states, n_actions, sparse, roots)
+
+    model = cache.get(key)
+    if model is None:
+        model = mdp.from_env(env, n_states, n_actions, sparse=sparse, start_states=start_states)
+        cache.put(key, model)
+    return model
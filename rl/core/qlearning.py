@@ -1,10 +1,15 @@
 from typing import List, Callable, Tuple, Dict
 import numpy as np
-import random
+from rl.core.exploration import ExplorationNoise
 def q_learning(state_space: List[int], actions: List[int], step: Callable, reset: Callable, 
                episodes: int = 1000, alpha: float = 0.1, gamma: float = 1.0, 
-               epsilon: float = 0.3) -> Tuple[Dict, Dict, Dict]:
-    Q = {(s, a): 0 for s in state_space for a in actions}
+               epsilon: float = 0.3, Q: np.ndarray = None,
+               noise: ExplorationNoise = None) -> Tuple[np.ndarray, np.ndarray, Dict]:
+    # States and actions index the rows and columns of Q, which is updated in place when given
+    if Q is None:
+        Q = np.zeros((len(state_space), len(actions)))
+    if noise is None:
+        noise = ExplorationNoise(len(actions))
     
     episode_rewards = []
     episode_lengths = []
@@ -17,10 +22,7 @@ def q_learning(state_space: List[int], actions: List[int], step: Callable, reset
         
         done = False
         while not done and steps < max_steps:
-            if np.random.rand() < epsilon:
-                action = random.choice(actions)
-            else:
-                action = max(actions, key=lambda a: Q[(state, a)])
+            action = noise.epsilon_greedy(Q[state], epsilon)
             next_state, reward, done = step(state, action)
             
             total_reward += reward
@@ -29,12 +31,13 @@ def q_learning(state_space: List[int], actions: List[int], step: Callable, reset
             if done:
                 target_val = reward
             else:
-                best_next = max(Q[(next_state, a)] for a in actions)
+                # ndarray.argmax is several times cheaper than a max reduction on short rows
+                best_next = Q[next_state, Q[next_state].argmax()]
                 target_val = reward + gamma * best_next
-            Q[(state, action)] += alpha * (target_val - Q[(state, action)])
+            Q[state, action] += alpha * (target_val - Q[state, action])
             state = next_state
             
         episode_rewards.append(total_reward)
         episode_lengths.append(steps)
-    policy = {s: max(actions, key=lambda a: Q[(s, a)]) for s in state_space}
+    policy = np.argmax(Q, axis=1)
     return Q, policy, {'episode_rewards': episode_rewards, 'episode_lengths': episode_lengths}
@@ -1,16 +1,78 @@
-import random
-from typing import List, Callable, Tuple, Dict, Union
+from typing import List, Callable, Tuple, Dict
 import numpy as np
+from rl.core.exploration import ExplorationNoise
+
+
+class DiscountedWindow:
+    """Discounted sum over a sliding window of at most n rewards, oldest first
+
+    A two-stack queue on a ring buffer: rewards pushed since the last rebuild
+    are accumulated into back_sum with precomputed discount powers, and every
+    time the older segment runs out its suffix sums are recomputed in one
+    backward pass. Push, pop and value are O(1) amortized, and no sum is ever
+    divided by gamma, so long episodes don't accumulate rounding error.
+    """
+
+    def __init__(self, n: int, gamma: float):
+        self.n = n
+        self.gamma = gamma
+        self.powers = (gamma ** np.arange(n + 1)).tolist()
+        self.rewards = [0.0] * n
+        self.suffix = [0.0] * n
+        self.clear()
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+        self.front = 0
+        self.back_sum = 0.0
+
+    def push(self, reward: float):
+        self.rewards[(self.head + self.count) % self.n] = reward
+        self.back_sum += self.powers[self.count - self.front] * reward
+        self.count += 1
+
+    def _rebuild(self):
+        G = 0.0
+        for k in range(self.count - 1, -1, -1):
+            i = (self.head + k) % self.n
+            G = self.rewards[i] + self.gamma * G
+            self.suffix[i] = G
+        self.front = self.count
+        self.back_sum = 0.0
+
+    def value(self) -> float:
+        if self.front == 0:
+            self._rebuild()
+        return self.suffix[self.head] + self.powers[self.front] * self.back_sum
+
+    def pop(self):
+        if self.front == 0:
+            self._rebuild()
+        self.head = (self.head + 1) % self.n
+        self.count -= 1
+        self.front -= 1
+
 def td(state_space: List[int], actions: List[int], step: Callable, reset: Callable, 
        episodes: int = 1000, alpha: float = 0.01, gamma: float = 1.0, 
        epsilon: float = 0.3, nstep: bool = False, n: int = 1, 
-       q_based: bool = False) -> Tuple[Union[Dict, Dict], Dict, Dict]:
+       q_based: bool = False, Q: np.ndarray = None,
+       noise: ExplorationNoise = None) -> Tuple[np.ndarray, np.ndarray, Dict]:
+    # States and actions index V / the rows and columns of Q; a given Q is updated in place
+    n_states, n_actions = len(state_space), len(actions)
     if not q_based:
-        V = {s: 0 for s in state_space}
-        policy = {s: random.choice(actions) for s in state_space}
-    else:
-        Q = {(s, a): 0 for s in state_space for a in actions}
-        policy = {s: random.choice(actions) for s in state_space}
+        V = np.zeros(n_states)
+    elif Q is None:
+        Q = np.zeros((n_states, n_actions))
+    if noise is None:
+        noise = ExplorationNoise(n_actions)
+    policy = noise.actions(n_states)
+    if q_based:
+        # Greedy actions kept current by re-scoring only the rows updated in an episode
+        greedy = np.argmax(Q, axis=1)
+    if nstep:
+        window = DiscountedWindow(n, gamma)
+        discount_n = gamma ** n
     episode_rewards = []
     episode_lengths = []
     for _ in range(episodes):
@@ -18,16 +80,14 @@ def td(state_space: List[int], actions: List[int], step: Callable, reset: Callab
         total_reward = 0
         ep_steps = 0
         done = False
+        dirty = []
         
         if not nstep:
             max_steps = 1000
             steps = 0
             
             while not done and steps < max_steps:
-                if np.random.rand() < epsilon:
-                    action = random.choice(actions)
-                else:
-                    action = policy[state]
+                action = noise.action() if noise.uniform() < epsilon else policy[state]
                 next_state, reward, done = step(state, action)
                 
                 total_reward += reward
@@ -37,65 +97,59 @@ def td(state_space: List[int], actions: List[int], step: Callable, reset: Callab
                     V[state] += alpha * (reward + gamma * v_next - V[state])
                 else:
                     if not done:
-                        if np.random.rand() < epsilon:
-                            next_action = random.choice(actions)
-                        else:
-                            next_action = policy[next_state]
-                        target_val = reward + gamma * Q[(next_state, next_action)]
+                        next_action = noise.action() if noise.uniform() < epsilon else policy[next_state]
+                        target_val = reward + gamma * Q[next_state, next_action]
                     else:
                         target_val = reward
-                    Q[(state, action)] += alpha * (target_val - Q[(state, action)])
+                    Q[state, action] += alpha * (target_val - Q[state, action])
+                    dirty.append(state)
                 state = next_state
                 steps += 1
                 
         else:
-            states = [state]
-            actions_taken = []
-            rewards = []
+            # States and actions of the last n + 1 steps live in ring buffers indexed by t % (n + 1)
+            size = n + 1
+            states = [0] * size
+            actions_taken = [0] * size
+            window.clear()
+            states[0] = state
+            actions_taken[0] = noise.action() if noise.uniform() < epsilon else policy[state]
             t = 0
             T = float('inf')
             max_steps = 1000
             
             while True:
                 if t < T:
-                    if np.random.rand() < epsilon:
-                        action = random.choice(actions)
-                    else:
-                        action = policy[state]
-                    next_state, reward, done = step(state, action)
+                    next_state, reward, done = step(state, actions_taken[t % size])
                     
                     total_reward += reward
                     ep_steps += 1
-                    states.append(next_state)
-                    actions_taken.append(action)
-                    rewards.append(reward)
+                    window.push(reward)
                     
                     if done or t >= max_steps:
                         T = t + 1
+                    else:
+                        states[(t + 1) % size] = next_state
+                        actions_taken[(t + 1) % size] = noise.action() if noise.uniform() < epsilon else policy[next_state]
                     
                     state = next_state
                 tau = t - n + 1
                 if tau >= 0:
-                    G = 0
-                    for i in range(tau + 1, min(tau + n, T) + 1):
-                        if i - 1 < len(rewards):
-                            G += (gamma ** (i - tau - 1)) * rewards[i - 1]
+                    # Discounted sum of rewards tau + 1 .. min(tau + n, T)
+                    G = window.value()
+                    window.pop()
                     
                     if tau + n < T:
-                        if not q_based:
-                            if tau + n < len(states):
-                                G += (gamma ** n) * V[states[tau + n]]
-                        else:
-                            if tau + n < len(states) and tau + n < len(actions_taken):
-                                G += (gamma ** n) * Q[(states[tau + n], actions_taken[tau + n])]
+                        s_n = states[(tau + n) % size]
+                        G += discount_n * (V[s_n] if not q_based else Q[s_n, actions_taken[(tau + n) % size]])
                     
+                    s_tau = states[tau % size]
                     if not q_based:
-                        if tau < len(states):
-                            V[states[tau]] += alpha * (G - V[states[tau]])
+                        V[s_tau] += alpha * (G - V[s_tau])
                     else:
-                        if tau < len(states) and tau < len(actions_taken):
-                            sa = (states[tau], actions_taken[tau])
-                            Q[sa] += alpha * (G - Q[sa])
+                        a_tau = actions_taken[tau % size]
+                        Q[s_tau, a_tau] += alpha * (G - Q[s_tau, a_tau])
+                        dirty.append(s_tau)
                 
                 if tau == T - 1:
                     break
@@ -104,10 +158,9 @@ def td(state_space: List[int], actions: List[int], step: Callable, reset: Callab
         episode_rewards.append(total_reward)
         episode_lengths.append(ep_steps)
         if not q_based:
-            for s in state_space:
-                policy[s] = random.choice(actions)
+            policy = noise.actions(n_states)
         else:
-            for s in state_space:
-                policy[s] = max(actions, key=lambda a: Q[(s, a)])
+            greedy[dirty] = Q[dirty].argmax(axis=1)
+            policy = greedy
     stats = {'episode_rewards': episode_rewards, 'episode_lengths': episode_lengths}
     return (V, policy, stats) if not q_based else (Q, policy, stats)
@@ -4,6 +4,8 @@ from rl.core.wrappers.base import Agent
 from rl.core.wrappers.value_iteration import ValueIterationAgent
 from rl.core.wrappers.policy_iteration import PolicyIterationAgent
 from rl.core.wrappers.policy_evaluation import PolicyEvaluationAgent
+from rl.core.wrappers.rtdp import RTDPAgent
+from rl.core.wrappers.minimax import MinimaxAgent
 from rl.core.wrappers.monte_carlo import MonteCarloAgent
 from rl.core.wrappers.qlearning import QLearningAgent
 from rl.core.wrappers.td0 import TD0Agent
@@ -16,6 +18,8 @@ __all__ = [
     'ValueIterationAgent',
     'PolicyIterationAgent',
     'PolicyEvaluationAgent',
+    'RTDPAgent',
+    'MinimaxAgent',
     'MonteCarloAgent',
     'QLearningAgent',
     'TD0Agent',
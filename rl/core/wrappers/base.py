@@ -1,13 +1,18 @@
 from abc import ABC, abstractmethod
 import numpy as np
 import time
+from rl.core.exploration import ExplorationNoise
 class Agent(ABC):
     
-    def __init__(self, env, gamma=0.99):
+    def __init__(self, env, gamma=0.99, seed=None, compiled=True):
         self.env = env
         self.gamma = gamma
+        self.seed = seed
+        self.compiled = compiled
         self.n_states = env.get_state_space_size()
         self.n_actions = env.get_action_space_size()
+        # Single source of exploration randomness, reproducible from seed
+        self.noise = ExplorationNoise(self.n_actions, seed)
     
     @abstractmethod
     def train(self, progress_callback=None):
@@ -17,8 +22,39 @@ class Agent(ABC):
     def get_action(self, state, explore=False):
         pass
     
+    def training_functions(self):
+        """Return (step, reset) for the model-free learners, with step(state, action) -> (next_state, reward, done)
+
+        Model-based environments are compiled to lookup tables for the duration
+        of a training run; all others are stepped through env.step, seeded from
+        the agent seed when one is given.
+        """
+        if self.compiled:
+            try:
+                # A child stream keeps environment sampling independent of exploration
+                env = self.env.compile(seed=self.noise.rng.spawn(1)[0])
+                return env.sample, env.reset
+            except NotImplementedError:
+                pass
+
+        if self.seed is not None:
+            self.env.seed(int(self.noise.rng.spawn(1)[0].integers(2 ** 31)))
+
+        def step_fn(s, a):
+            ns, r, done, _ = self.env.step(a)
+            return ns, r, done
+
+        return step_fn, self.env.reset
+    
+    def training_batch_env(self):
+        """Environment running many copies at once (see BaseEnvironment.vectorize), or None if unsupported"""
+        try:
+            return self.env.vectorize(seed=self.noise.rng.spawn(1)[0])
+        except NotImplementedError:
+            return None
+    
     def select_epsilon_greedy(self, Q_values, epsilon):
-        return np.random.randint(self.n_actions) if np.random.random() < epsilon else np.argmax(Q_values)
+        return self.noise.epsilon_greedy(Q_values, epsilon)
     
     @staticmethod
     def create_training_history(start_time, episodes, episode_rewards, episode_lengths):
@@ -45,11 +81,14 @@ class Agent(ABC):
     
     @staticmethod
     def create_dp_history(start_time, stats):
-        return {
+        history = {
             'training_time': time.time() - start_time,
-            'converged': True,
+            'converged': stats.get('converged', True),
             'iterations': stats['iterations'],
             'deltas': stats['deltas']
         }
+        # Solver diagnostics such as per-iteration timings are passed through
+        history.update({k: v for k, v in stats.items() if k not in history})
+        return history
     def select_greedy(self, Q_values):
         return np.argmax(Q_values)
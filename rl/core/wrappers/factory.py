@@ -1,5 +1,7 @@
 from rl.core.wrappers.value_iteration import ValueIterationAgent
 from rl.core.wrappers.policy_iteration import PolicyIterationAgent
+from rl.core.wrappers.rtdp import RTDPAgent
+from rl.core.wrappers.minimax import MinimaxAgent
 from rl.core.wrappers.monte_carlo import MonteCarloAgent
 from rl.core.wrappers.qlearning import QLearningAgent
 from rl.core.wrappers.td0 import TD0Agent
@@ -10,6 +12,8 @@ def create_agent(algo, env, **params):
     AGENTS = {
         'Value Iteration': ValueIterationAgent,
         'Policy Iteration': PolicyIterationAgent,
+        'RTDP': RTDPAgent,
+        'Minimax': MinimaxAgent,
         'Monte Carlo': MonteCarloAgent,
         'Q-Learning': QLearningAgent,
         'TD(0)': TD0Agent,
@@ -0,0 +1,39 @@
+import numpy as np
+import time
+from rl.core.wrappers.base import Agent
+from rl.core import minimax
+from rl.envs.tictactoe import TicTacToeEnv
+class MinimaxAgent(Agent):
+    """Exact TicTacToe solution by backward induction over symmetry-reduced positions
+
+    Against opponent='random' (the environment's own opponent) the values are
+    expectimax values; opponent='minimax' assumes a perfect adversary instead.
+    """
+
+    def __init__(self, env, gamma=0.99, opponent='random', **kwargs):
+        super().__init__(env, gamma)
+        self.opponent = opponent
+        self.Q = np.zeros((self.n_states, self.n_actions))
+        self.V = None
+        self.policy = None
+
+    def train(self, progress_callback=None):
+        start = time.time()
+        if not isinstance(self.env, TicTacToeEnv):
+            raise ValueError("Minimax requires the TicTacToe environment")
+
+        Q_dict, policy_dict, stats = minimax.solve_tictactoe(self.gamma, self.opponent)
+
+        for s, q in Q_dict.items():
+            self.Q[s] = q
+        self.V = self.Q.max(axis=1)
+        self.policy = np.zeros(self.n_states, dtype=int)
+        for s, a in policy_dict.items():
+            self.policy[s] = a
+
+        # A single backward-induction pass
+        stats.update(iterations=1, deltas=[0.0])
+        return self.create_dp_history(start, stats)
+
+    def get_action(self, state, explore=False):
+        return self.policy[state]
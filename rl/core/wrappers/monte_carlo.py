@@ -5,8 +5,8 @@ from rl.core import mc
 class MonteCarloAgent(Agent):
     
     def __init__(self, env, gamma=0.99, epsilon=0.1, epsilon_decay=0.995, epsilon_min=0.01,
-                 episodes=1000, mc_type='FV', use_alpha=False, alpha=0.1, **kwargs):
-        super().__init__(env, gamma)
+                 episodes=1000, mc_type='FV', use_alpha=False, alpha=0.1, seed=None, compiled=True, **kwargs):
+        super().__init__(env, gamma, seed, compiled)
         self.epsilon = epsilon
         self.epsilon_decay = epsilon_decay
         self.epsilon_min = epsilon_min
@@ -17,20 +17,23 @@ class MonteCarloAgent(Agent):
         self.Q = np.zeros((self.n_states, self.n_actions))
         self.policy = None
     
-    def _generate_episode(self, policy, return_actions=False):
+    def _generate_episode(self, policy, return_actions=False, step_fn=None, reset_fn=None):
         states = []
         actions_taken = []
         rewards = [0]
         
-        state = self.env.reset()
+        if step_fn is None:
+            step_fn, reset_fn = self.training_functions()
+
+        state = reset_fn()
         states.append(state)
         done = False
         max_steps = 1000
         steps = 0
         
         while not done and steps < max_steps:
-            action = policy.get(state, np.random.randint(self.n_actions))
-            next_state, reward, done, _ = self.env.step(action)
+            action = policy[state]
+            next_state, reward, done = step_fn(state, action)
             
             states.append(next_state)
             actions_taken.append(action)
@@ -49,12 +52,13 @@ class MonteCarloAgent(Agent):
         state_space = list(range(self.n_states))
         actions = list(range(self.n_actions))
         
-        Q_dict, policy_dict, stats = mc.monte_carlo( state_space, actions, self._generate_episode, episodes=self.episodes, gamma=self.gamma, type=self.mc_type, fixed_alpha=self.use_alpha, alpha=self.alpha)
-        
-        for (s, a), val in Q_dict.items():
-            self.Q[s, a] = val
-        
-        self.policy = np.array([policy_dict.get(s, 0) for s in range(self.n_states)])
+        step_fn, reset_fn = self.training_functions()
+
+        def generate_episode(policy, return_actions=False):
+            return self._generate_episode(policy, return_actions, step_fn, reset_fn)
+
+        self.Q = np.zeros((self.n_states, self.n_actions))
+        _, self.policy, stats = mc.monte_carlo( state_space, actions, generate_episode, episodes=self.episodes, gamma=self.gamma, type=self.mc_type, fixed_alpha=self.use_alpha, alpha=self.alpha, Q=self.Q, noise=self.noise)
         
         return self.create_training_history( start, self.episodes, stats['episode_rewards'], stats['episode_lengths'] )
     
@@ -5,8 +5,8 @@ from rl.core import td
 class NStepTDAgent(Agent):
     
     def __init__(self, env, gamma=0.99, alpha=0.1, epsilon=0.1, 
-                 epsilon_decay=0.995, epsilon_min=0.01, episodes=1000, n_steps=3, **kwargs):
-        super().__init__(env, gamma)
+                 epsilon_decay=0.995, epsilon_min=0.01, episodes=1000, n_steps=3, seed=None, compiled=True, **kwargs):
+        super().__init__(env, gamma, seed, compiled)
         self.alpha = alpha
         self.epsilon = epsilon
         self.epsilon_decay = epsilon_decay
@@ -22,19 +22,10 @@ class NStepTDAgent(Agent):
         state_space = list(range(self.n_states))
         actions = list(range(self.n_actions))
         
-        def step_fn(s, a):
-            ns, r, done, _ = self.env.step(a)
-            return ns, r, done
+        step_fn, reset_fn = self.training_functions()
         
-        def reset_fn():
-            return self.env.reset()
-        
-        Q_dict, policy_dict, stats = td.td(state_space, actions, step_fn, reset_fn, episodes=self.episodes, alpha=self.alpha, gamma=self.gamma, epsilon=self.epsilon, nstep=True, n=self.n_steps, q_based=True)
-        
-        for (s, a), val in Q_dict.items():
-            self.Q[s, a] = val
-        
-        self.policy = np.array([policy_dict.get(s, 0) for s in range(self.n_states)])
+        self.Q = np.zeros((self.n_states, self.n_actions))
+        _, self.policy, stats = td.td(state_space, actions, step_fn, reset_fn, episodes=self.episodes, alpha=self.alpha, gamma=self.gamma, epsilon=self.epsilon, nstep=True, n=self.n_steps, q_based=True, Q=self.Q, noise=self.noise)
         return self.create_training_history(start, self.episodes, stats['episode_rewards'], stats['episode_lengths'])
     
     def get_action(self, state, explore=False):
@@ -1,15 +1,20 @@
 import numpy as np
 import time
 from rl.core.wrappers.base import Agent
-from rl.core import dp
+from rl.core import dp, mdp, model_cache
 class PolicyEvaluationAgent(Agent):
     
-    def __init__(self, env, gamma=0.99, theta=0.001, max_iterations=1000, **kwargs):
+    def __init__(self, env, gamma=0.99, theta=0.001, max_iterations=1000, backend='auto', prune=True, cache_model=True, eval_method='direct', **kwargs):
         super().__init__(env, gamma)
         self.theta = theta
         self.max_iterations = max_iterations
+        self.backend = backend
+        self.prune = prune
+        self.cache_model = cache_model
+        self.eval_method = eval_method
         self.V = None
         self.Q = None
+        self.action_gaps = None
     
     def _build_mdp(self):
         P = {}
@@ -28,27 +33,51 @@ class PolicyEvaluationAgent(Agent):
                     raise ValueError("Policy Evaluation requires model-based environment")
         
         return P, R
+
+    def _build_model(self):
+        try:
+            sparse = {'tensor': False, 'sparse': True}.get(self.backend)
+            start_states = self.env.get_initial_states() if self.prune else None
+            build = model_cache.cached_from_env if self.cache_model else mdp.from_env
+            return build(self.env, self.n_states, self.n_actions, sparse=sparse, start_states=start_states)
+        except NotImplementedError:
+            raise ValueError("Policy Evaluation requires model-based environment")
     
     def train(self, progress_callback=None):
         start = time.time()
+        if self.backend == 'dict':
+            return self._train_dicts(start)
+
+        model = self._build_model()
+        V = dp.policy_evaluation_array(model.uniform_policy(), model, self.gamma, self.theta, self.eval_method)
+        self._store_solution(model, V)
+
+        return {
+            'training_time': time.time() - start,
+            'converged': True,
+            **dp.action_gap_stats(self.action_gaps)
+        }
+
+    def _store_solution(self, model, V):
+        Q, _, gaps = dp.extract_policy_array(model, V, self.gamma)
+        self.V = model.expand(V)
+        self.Q = model.expand(np.where(model.mask, Q, 0.0))
+        self.action_gaps = model.expand(gaps, fill=np.nan)
+
+    def _train_dicts(self, start):
         P, R = self._build_mdp()
         
         policy = {s : {a : 1.0 / len(P[s]) for a in P[s]} for s in P if P[s]}
         
         V_dict = dp.policy_evaluation(policy, P, R, self.gamma, self.theta)
         
-        self.V = np.array([V_dict.get(s, 0) for s in range(self.n_states)])
-        
-
-        self.Q = np.zeros((self.n_states, self.n_actions))
-        for s in range(self.n_states):
-            for a in range(self.n_actions):
-                if s in P and a in P[s]:
-                    self.Q[s, a] = dp.bellman_equation(P, R, V_dict, self.gamma, s, mode="Q", action=a)
+        model = mdp.from_dicts(P, R, self.n_states, self.n_actions)
+        self._store_solution(model, np.array([V_dict.get(s, 0) for s in range(self.n_states)]))
         
         return {
             'training_time': time.time() - start,
-            'converged': True
+            'converged': True,
+            **dp.action_gap_stats(self.action_gaps)
         }
     
     def get_action(self, state, explore=False):
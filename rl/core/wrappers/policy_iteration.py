@@ -1,16 +1,22 @@
 import numpy as np
 import time
 from rl.core.wrappers.base import Agent
-from rl.core import dp
+from rl.core import dp, mdp, model_cache
 class PolicyIterationAgent(Agent):
     
-    def __init__(self, env, gamma=0.99, theta=0.001, max_iterations=1000, **kwargs):
+    def __init__(self, env, gamma=0.99, theta=0.001, max_iterations=1000, backend='auto', prune=True, cache_model=True, eval_method='direct', eval_sweeps=None, **kwargs):
         super().__init__(env, gamma)
         self.theta = theta
         self.max_iterations = max_iterations
+        self.backend = backend
+        self.prune = prune
+        self.cache_model = cache_model
+        self.eval_method = eval_method
+        self.eval_sweeps = None if eval_sweeps == 'full' else eval_sweeps
         self.V = None
         self.policy = None
         self.Q = None
+        self.action_gaps = None
     
     def _build_mdp(self):
         P = {}
@@ -29,26 +35,51 @@ class PolicyIterationAgent(Agent):
                     raise ValueError("Policy Iteration requires model-based environment")
         
         return P, R
+
+    def _build_model(self):
+        try:
+            sparse = {'tensor': False, 'sparse': True}.get(self.backend)
+            start_states = self.env.get_initial_states() if self.prune else None
+            build = model_cache.cached_from_env if self.cache_model else mdp.from_env
+            return build(self.env, self.n_states, self.n_actions, sparse=sparse, start_states=start_states)
+        except NotImplementedError:
+            raise ValueError("Policy Iteration requires model-based environment")
     
     def train(self, progress_callback=None):
         start = time.time()
+        if self.backend == 'dict':
+            return self._train_dicts(start)
+
+        model = self._build_model()
+        if self.eval_sweeps is None:
+            V, policy, stats = dp.policy_iteration_array(model, self.gamma, self.theta, self.eval_method)
+        else:
+            V, policy, stats = dp.modified_policy_iteration_array(model, self.gamma, self.theta, self.eval_sweeps)
+        self._store_solution(model, V)
+        self.policy = model.expand(policy, fill=0)
+        stats.update(dp.action_gap_stats(self.action_gaps))
+
+        return self.create_dp_history(start, stats)
+
+    def _store_solution(self, model, V):
+        Q, _, gaps = dp.extract_policy_array(model, V, self.gamma)
+        self.V = model.expand(V)
+        self.Q = model.expand(np.where(model.mask, Q, 0.0))
+        self.action_gaps = model.expand(gaps, fill=np.nan)
+
+    def _train_dicts(self, start):
         P, R = self._build_mdp()
         
         V_dict, policy_dict, stats = dp.policy_iteration(P, R, self.gamma, self.theta)
         
-        self.V = np.array([V_dict[s] for s in range(self.n_states)])
+        model = mdp.from_dicts(P, R, self.n_states, self.n_actions)
+        self._store_solution(model, np.array([V_dict[s] for s in range(self.n_states)]))
         self.policy = np.zeros(self.n_states, dtype=int)
         
         for s in range(self.n_states):
             if s in policy_dict:
                 self.policy[s] = list(policy_dict[s].keys())[0]
-        
-
-        self.Q = np.zeros((self.n_states, self.n_actions))
-        for s in range(self.n_states):
-            for a in range(self.n_actions):
-                if s in P and a in P[s]:
-                    self.Q[s, a] = dp.bellman_equation(P, R, V_dict, self.gamma, s, mode="Q", action=a)
+        stats.update(dp.action_gap_stats(self.action_gaps))
         
         return self.create_dp_history(start, stats)
     
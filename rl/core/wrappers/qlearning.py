@@ -1,16 +1,17 @@
 import numpy as np
 import time
 from rl.core.wrappers.base import Agent
-from rl.core import qlearning
+from rl.core import qlearning, batched
 class QLearningAgent(Agent):
     
-    def __init__(self, env, gamma=0.99, alpha=0.1, epsilon=0.3, epsilon_decay=0.995, epsilon_min=0.01, episodes=1000, **kwargs):
-        super().__init__(env, gamma)
+    def __init__(self, env, gamma=0.99, alpha=0.1, epsilon=0.3, epsilon_decay=0.995, epsilon_min=0.01, episodes=1000, seed=None, compiled=True, n_envs=1, **kwargs):
+        super().__init__(env, gamma, seed, compiled)
         self.alpha = alpha
         self.epsilon = epsilon
         self.epsilon_decay = epsilon_decay
         self.epsilon_min = epsilon_min
         self.episodes = episodes
+        self.n_envs = n_envs
         self.Q = np.zeros((self.n_states, self.n_actions))
         self.policy = None
     
@@ -21,26 +22,24 @@ class QLearningAgent(Agent):
         state_space = list(range(self.n_states))
         actions = list(range(self.n_actions))
         
-        def step_fn(s, a):
-            ns, r, done, _ = self.env.step(a)
-            return ns, r, done
-        
-        def reset_fn():
-            return self.env.reset()
-        
-
-        Q_dict, policy_dict, stats = qlearning.q_learning(
-            state_space, actions, step_fn, reset_fn,
-            episodes=self.episodes, alpha=self.alpha,
-            gamma=self.gamma, epsilon=self.epsilon
-        )
-        
-
-        for (s, a), val in Q_dict.items():
-            self.Q[s, a] = val
-        
-        
-        self.policy = np.array([policy_dict.get(s, 0) for s in range(self.n_states)])
+        self.Q = np.zeros((self.n_states, self.n_actions))
+        batch_env = self.training_batch_env() if self.n_envs > 1 else None
+        if batch_env is not None:
+            try:
+                _, self.policy, stats = batched.batched_td_control(
+                    state_space, actions, batch_env, n_envs=self.n_envs,
+                    episodes=self.episodes, alpha=self.alpha,
+                    gamma=self.gamma, epsilon=self.epsilon, Q=self.Q, noise=self.noise
+                )
+            finally:
+                batch_env.close()
+        else:
+            step_fn, reset_fn = self.training_functions()
+            _, self.policy, stats = qlearning.q_learning(
+                state_space, actions, step_fn, reset_fn,
+                episodes=self.episodes, alpha=self.alpha,
+                gamma=self.gamma, epsilon=self.epsilon, Q=self.Q, noise=self.noise
+            )
         
         return self.create_training_history(
             start, self.episodes, 
@@ -0,0 +1,102 @@
+import numpy as np
+import random
+import time
+from rl.core.wrappers.base import Agent
+from rl.core import dp
+class RTDPAgent(Agent):
+    """Labelled real-time DP: backups along greedy trajectories from env.reset()
+
+    Transitions are queried lazily through get_transition_prob and values are kept
+    in a dict, so planning cost depends on the states actually reached rather than
+    on the size of the state space. initial_value must upper-bound the optimal
+    values for converged (solved) states to be optimal; None (the default) uses
+    max(r_max, 0) / (1 - gamma) with r_max from env.get_reward_bound().
+    """
+
+    def __init__(self, env, gamma=0.99, theta=0.001, max_iterations=1000, max_depth=1000, initial_value=None, labelled=True, seed=None, **kwargs):
+        super().__init__(env, gamma, seed)
+        self.theta = theta
+        self.max_iterations = max_iterations
+        self.max_depth = max_depth
+        self.initial_value = initial_value
+        self.labelled = labelled
+        # Values, Q rows and greedy actions of the states RTDP visited
+        self.V_table = {}
+        self.Q_table = {}
+        self.policy_table = {}
+        self.value_bound = None
+
+    def train(self, progress_callback=None):
+        start = time.time()
+        actions = list(range(self.n_actions))
+
+        try:
+            self.env.get_transition_prob(self.env.reset(), 0)
+        except NotImplementedError:
+            raise ValueError("RTDP requires model-based environment")
+        initial_value = self._value_bound() if self.initial_value is None else self.initial_value
+
+        # Start states and sampled successors both follow from the agent seed
+        rng = None
+        if self.seed is not None:
+            self.env.seed(int(self.noise.rng.spawn(1)[0].integers(2 ** 31)))
+            rng = random.Random(int(self.noise.rng.spawn(1)[0].integers(2 ** 63)))
+
+        self.V_table, stats = dp.rtdp(
+            self.env.get_transition_prob, actions, self.env.reset,
+            self.gamma, self.theta, trials=self.max_iterations, max_depth=self.max_depth,
+            initial_value=initial_value, labelled=self.labelled,
+            initial_states=self.env.get_initial_states(), rng=rng
+        )
+
+        self.value_bound = float(initial_value)
+        self.Q_table, self.policy_table = {}, {}
+        for state in self.V_table:
+            self.Q_table[state] = self._lookahead(state)
+            self.policy_table[state] = int(np.argmax(self.Q_table[state]))
+
+        stats['initial_value'] = self.value_bound
+        return self.create_dp_history(start, stats)
+
+    def _value_bound(self):
+        # No policy collects more than r_max per step, and episodes that end collect 0 afterwards.
+        # Rewards queried so far would not do: one seen later could exceed them
+        r_max = self.env.get_reward_bound()
+        if r_max is None:
+            raise ValueError("RTDP needs an explicit initial value (an upper bound on V*) for environments without get_reward_bound")
+        if r_max <= 0.0:
+            return 0.0
+        if self.gamma >= 1:
+            raise ValueError("RTDP needs an explicit initial value (an upper bound on V*) for gamma = 1 with positive rewards")
+        return r_max / (1 - self.gamma)
+
+    def _lookahead(self, state):
+        q = np.zeros(self.n_actions)
+        for a in range(self.n_actions):
+            for ns, (prob, reward) in self.env.get_transition_prob(state, a).items():
+                q[a] += prob * (reward + self.gamma * self.V_table.get(ns, self.value_bound))
+        return q
+
+    @property
+    def V(self):
+        """Dense V for the UI, built on access; states never reached keep the initial value"""
+        if self.value_bound is None:
+            return None
+        V = np.full(self.n_states, self.value_bound)
+        V[list(self.V_table)] = list(self.V_table.values())
+        return V
+
+    @property
+    def Q(self):
+        """Dense Q for the UI, built on access like V"""
+        if self.value_bound is None:
+            return None
+        Q = np.full((self.n_states, self.n_actions), self.value_bound)
+        for state, q in self.Q_table.items():
+            Q[state] = q
+        return Q
+
+    def get_action(self, state, explore=False):
+        if state in self.policy_table:
+            return self.policy_table[state]
+        return self.select_greedy(self._lookahead(state))
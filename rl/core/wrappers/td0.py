@@ -4,8 +4,8 @@ from rl.core.wrappers.base import Agent
 from rl.core import td
 class TD0Agent(Agent):
     
-    def __init__(self, env, gamma=0.99, alpha=0.1, epsilon=0.1, epsilon_decay=0.995, epsilon_min=0.01, episodes=1000, **kwargs):
-        super().__init__(env, gamma)
+    def __init__(self, env, gamma=0.99, alpha=0.1, epsilon=0.1, epsilon_decay=0.995, epsilon_min=0.01, episodes=1000, seed=None, compiled=True, **kwargs):
+        super().__init__(env, gamma, seed, compiled)
         self.alpha = alpha
         self.epsilon = epsilon
         self.epsilon_decay = epsilon_decay
@@ -22,27 +22,16 @@ class TD0Agent(Agent):
         state_space = list(range(self.n_states))
         actions = list(range(self.n_actions))
         
-        def step_fn(s, a):
-            ns, r, done, _ = self.env.step(a)
-            return ns, r, done
+        step_fn, reset_fn = self.training_functions()
         
-        def reset_fn():
-            return self.env.reset()
-        
-        V_dict, policy_dict, stats = td.td(
+        self.V, self.policy, stats = td.td(
             state_space, actions, step_fn, reset_fn,
             episodes=self.episodes, alpha=self.alpha,
             gamma=self.gamma, epsilon=self.epsilon,
-            nstep=False, q_based=False
+            nstep=False, q_based=False, noise=self.noise
         )
         
-        self.V = np.array([V_dict.get(s, 0) for s in range(self.n_states)])
-        self.policy = np.array([policy_dict.get(s, 0) for s in range(self.n_states)])
-        
-        self.Q = np.zeros((self.n_states, self.n_actions))
-        for s in range(self.n_states):
-            for a in range(self.n_actions):
-                self.Q[s, a] = self.V[s]
+        self.Q = np.repeat(self.V[:, None], self.n_actions, axis=1)
         return self.create_training_history(
             start, self.episodes, 
             stats['episode_rewards'], 
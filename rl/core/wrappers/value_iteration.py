@@ -1,16 +1,23 @@
 import numpy as np
 import time
 from rl.core.wrappers.base import Agent
-from rl.core import dp
+from rl.core import dp, mdp, model_cache
 class ValueIterationAgent(Agent):
     
-    def __init__(self, env, gamma=0.99, theta=0.001, max_iterations=1000, **kwargs):
+    def __init__(self, env, gamma=0.99, theta=0.001, max_iterations=1000, backend='auto', prune=True, cache_model=True, solver='sweep', n_workers=None, **kwargs):
         super().__init__(env, gamma)
         self.theta = theta
         self.max_iterations = max_iterations
+        self.backend = backend
+        self.prune = prune
+        self.cache_model = cache_model
+        self.solver = solver
+        self.n_workers = n_workers
         self.V = None
         self.policy = None
         self.Q = None
+        self.action_gaps = None
+        self.model = None
     
     def _build_mdp(self):
         P = {}
@@ -29,30 +36,111 @@ class ValueIterationAgent(Agent):
                     raise ValueError("Value Iteration requires model-based environment")
         
         return P, R
+
+    def _build_model(self):
+        try:
+            sparse = {'tensor': False, 'sparse': True}.get(self.backend)
+            start_states = self.env.get_initial_states() if self.prune else None
+            build = model_cache.cached_from_env if self.cache_model else mdp.from_env
+            return build(self.env, self.n_states, self.n_actions, sparse=sparse, start_states=start_states)
+        except NotImplementedError:
+            raise ValueError("Value Iteration requires model-based environment")
     
     def train(self, progress_callback=None):
         start = time.time()
+        if self.backend == 'dict':
+            return self._train_dicts(start)
+
+        model = self._build_model()
+        if self.solver == 'prioritized':
+            V, stats = dp.prioritized_value_iteration_array(model, self.gamma, self.theta)
+        elif self.solver == 'topological':
+            V, stats = dp.topological_value_iteration_array(model, self.gamma, self.theta)
+        elif self.solver == 'bounded':
+            V, stats = dp.bounded_value_iteration_array(model, self.gamma, self.theta)
+        elif self.solver == 'multigrid':
+            grid_shape = self.env.get_grid_shape()
+            if grid_shape is None:
+                raise ValueError("Multigrid solver requires a grid environment")
+            V, stats = dp.multigrid_value_iteration_array(model, self.gamma, self.theta, grid_shape)
+        elif self.solver == 'parallel':
+            V, stats = dp.parallel_value_iteration_array(model, self.gamma, self.theta, self.n_workers)
+        else:
+            V, stats = dp.value_iteration_array(model, self.gamma, self.theta)
+        self._store_solution(model, V)
+        stats.update(dp.action_gap_stats(self.action_gaps))
+
+        return self.create_dp_history(start, stats)
+
+    def train_batch(self, gammas, thetas=None, rewards=None):
+        """Solve the same model for several discount factors (and thetas / reward variants)
+
+        Returns one DP history per configuration, each with its 'gamma' and 'theta'.
+        The agent keeps the solution of the first configuration.
+        """
+        start = time.time()
+        model = self._build_model()
+        V, stats = dp.batched_value_iteration_array(model, gammas, self.theta if thetas is None else thetas, rewards)
+        elapsed = time.time() - start
+
+        histories = []
+        for config_stats in stats:
+            history = self.create_dp_history(start, config_stats)
+            # The batch is solved jointly, so each configuration is charged an equal share
+            history['training_time'] = elapsed / len(stats)
+            histories.append(history)
+
+        self.gamma = stats[0]['gamma']
+        self._store_solution(model, V[0])
+        histories[0].update(dp.action_gap_stats(self.action_gaps))
+        return histories
+
+    def replan(self, changed_states=None, progress_callback=None):
+        """Re-solve after the environment layout changed, warm-started from the current solution
+
+        changed_states are the environment states (cells) that changed. States whose
+        transitions can depend on them, and states the previous model did not cover,
+        seed an incremental sweep. Without changed_states every state is checked.
+        Falls back to train() when there is no previous array solution.
+        """
+        if self.model is None or self.backend == 'dict':
+            return self.train(progress_callback)
+
+        start = time.time()
+        old_model = self.model
+        model = self._build_model()
+        V0 = self.V[model.states]
+
+        seeds = None
+        if changed_states is not None:
+            changed = np.asarray(changed_states, dtype=np.int64)
+            added = np.setdiff1d(model.states, old_model.states)
+            affected = np.concatenate([changed, added, old_model.predecessor_states(changed),
+                                       model.predecessor_states(changed)])
+            seeds = model.model_indices(affected)
+            seeds = seeds[seeds >= 0]
+
+        V, stats = dp.incremental_value_iteration_array(model, self.gamma, self.theta, V0, seeds)
+        self._store_solution(model, V)
+        stats.update(dp.action_gap_stats(self.action_gaps))
+
+        return self.create_dp_history(start, stats)
+
+    def _store_solution(self, model, V):
+        self.model = model
+        Q, policy, gaps = dp.extract_policy_array(model, V, self.gamma)
+        self.V = model.expand(V)
+        self.Q = model.expand(Q)
+        self.policy = model.expand(policy, fill=0)
+        self.action_gaps = model.expand(gaps, fill=np.nan)
+
+    def _train_dicts(self, start):
         P, R = self._build_mdp()
         
         V_dict, stats = dp.value_iteration(P, R, self.gamma, self.theta)
-        self.V = np.array([V_dict[s] for s in range(self.n_states)])
-        
-
-        self.policy = np.zeros(self.n_states, dtype=int)
-        self.Q = np.zeros((self.n_states, self.n_actions))
-        
-        for s in range(self.n_states):
-            if P[s]:
-                action_vals = []
-                for a in range(self.n_actions):
-                    if a in P[s]:
-                        q_val = dp.bellman_equation(P, R, V_dict, self.gamma, s, mode="Q", action=a)
-                        action_vals.append(q_val)
-                        self.Q[s, a] = q_val
-                    else:
-                        action_vals.append(-float('inf'))
-                        self.Q[s, a] = -float('inf')
-                self.policy[s] = np.argmax(action_vals)
+        model = mdp.from_dicts(P, R, self.n_states, self.n_actions)
+        self._store_solution(model, np.array([V_dict[s] for s in range(self.n_states)]))
+        stats.update(dp.action_gap_stats(self.action_gaps))
         
         return self.create_dp_history(start, stats)
     
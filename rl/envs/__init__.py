@@ -7,6 +7,7 @@ from rl.envs.tictactoe import TicTacToeEnv
 from rl.envs.corridor import CorridorEnv
 from rl.envs.two_rooms import TwoRoomsEnv
 from rl.envs.gym_wrapper import GymnasiumEnvWrapper
+from rl.envs.compiled import CompiledEnv
 
 
 def create_environment(name, **kwargs):
@@ -67,7 +68,7 @@ def create_environment(name, **kwargs):
             elif name == 'FrozenLake-8x8-Slippery':
                 return GymnasiumEnvWrapper('FrozenLake8x8-v1', name, is_slippery=True)
             else:
-                return GymnasiumEnvWrapper(env_id, name)
+                return GymnasiumEnvWrapper(env_id, name, vector_mode=ENVIRONMENTS[name].get('vector_mode', 'sync'))
         
         raise ValueError(f"Unknown environment: {name}")
 
@@ -80,5 +81,6 @@ __all__ = [
     'CorridorEnv',
     'TwoRoomsEnv',
     'GymnasiumEnvWrapper',
+    'CompiledEnv',
     'create_environment'
 ]
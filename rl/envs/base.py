@@ -39,6 +39,76 @@ class BaseEnvironment(ABC):
     """
     raise NotImplementedError("Environment doesn't support model-based methods")
   
+  def get_transition_model(self):
+    """Get the whole model as arrays for model-based methods
+    Returns: (next_states, probs, rewards, terminal), each of shape (S, A, K) where
+    K is the largest number of successors of any (s, a); unused slots have prob 0.
+    The default calls get_transition_prob once per (s, a) and marks nothing terminal,
+    so environments relying on it are not compiled (see compile).
+    """
+    n_states, n_actions = self.get_state_space_size(), self.get_action_space_size()
+    table = [[list(self.get_transition_prob(s, a).items()) for a in range(n_actions)]
+             for s in range(n_states)]
+    k = max((len(trans) for row in table for trans in row), default=1)
+    
+    next_states = np.zeros((n_states, n_actions, k), dtype=np.int64)
+    probs = np.zeros((n_states, n_actions, k))
+    rewards = np.zeros((n_states, n_actions, k))
+    for s, row in enumerate(table):
+      for a, trans in enumerate(row):
+        for i, (ns, (prob, reward)) in enumerate(trans):
+          next_states[s, a, i], probs[s, a, i], rewards[s, a, i] = ns, prob, reward
+    
+    return next_states, probs, rewards, np.zeros(next_states.shape, dtype=bool)
+  
+  def seed(self, seed=None):
+    """Seed the environment's own randomness (random starts, opponents, layouts)
+    Default does nothing, which suits deterministic environments.
+    """
+    pass
+  
+  def get_reward_bound(self):
+    """Return an upper bound on the reward of any transition, or None if unknown
+    Used for optimistic initial values without building the model (see RTDPAgent).
+    """
+    return None
+  
+  def get_model_key(self):
+    """Return a hashable description of the transition model, used to cache built models
+    None (the default) disables caching for this environment.
+    """
+    return None
+  
+  def get_grid_shape(self):
+    """Return (height, width) if state s is the grid cell (s // width, s % width), else None
+    Used by the multigrid solver to coarsen the state space.
+    """
+    return None
+  
+  def get_initial_states(self):
+    """Return the states an episode can start from (used to prune model-based methods)
+    Default resets the environment once, which suits deterministic starts.
+    """
+    return [self.reset()]
+  
+  def compile(self, seed=None):
+    """Return a CompiledEnv with the same dynamics, stepped through lookup tables
+    Raises NotImplementedError if the environment is not model-based, or only
+    implements get_transition_prob: episodes need the terminal flags of
+    get_transition_model to end.
+    """
+    if type(self).get_transition_model is BaseEnvironment.get_transition_model:
+      raise NotImplementedError("Compiling needs terminal states from get_transition_model")
+    from rl.envs.compiled import CompiledEnv
+    return CompiledEnv(self, seed=seed)
+  
+  def vectorize(self, seed=None):
+    """Return an object running many copies of this environment at once
+    It offers reset_batch(n) -> states and step_batch(actions) -> (next_states, rewards, dones),
+    restarting finished copies automatically. Default is the compiled environment.
+    """
+    return self.compile(seed=seed)
+  
   def close(self):
     """Clean up resources"""
     pass
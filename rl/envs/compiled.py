@@ -0,0 +1,167 @@
+"""Compiled environments - model-based environments stepped through lookup tables"""
+from bisect import bisect_right
+import numpy as np
+from rl.envs.base import BaseEnvironment
+
+UNIFORM_BLOCK_SIZE = 4096
+
+
+class CompiledEnv(BaseEnvironment):
+    """Model-free view of a model-based environment built from its transition model
+
+    The (S, A, K) arrays of `get_transition_model()` are flattened to one row per
+    (s, a) at index s * A + a, with cumulative probabilities for sampling the
+    successor. `sample(state, action)` steps through plain list indexing and is
+    what the learners in `rl.core` call; `step` and `reset` keep the usual
+    BaseEnvironment interface. Episodes are truncated after max_steps, like a
+    Gymnasium TimeLimit, and start from initial_distribution (uniform over
+    `env.get_initial_states()` by default).
+
+    `reset_batch(n)` and `step_batch(actions)` run n independent copies with
+    array lookups. Finished copies restart automatically; `batch_states` holds
+    the state each copy is in after its last step.
+    """
+
+    def __init__(self, env, seed=None, max_steps=None, initial_distribution=None):
+        super().__init__()
+        self.env = env
+        self.max_steps = max_steps
+        self.steps = 0
+        self.rng = np.random.default_rng(seed)
+        self._uniforms = iter(())
+
+        next_states, probs, rewards, terminal = env.get_transition_model()
+        self.n_states, self.n_actions, k = next_states.shape
+        rows = self.n_states * self.n_actions
+
+        self.next_states = next_states.reshape(rows, k)
+        self.rewards = rewards.reshape(rows, k)
+        self.terminal = terminal.reshape(rows, k)
+        cum_probs = np.cumsum(probs.reshape(rows, k), axis=1)
+        # Normalizing by the row total makes the last successor end at exactly 1
+        self.cum_probs = cum_probs / np.where(cum_probs[:, -1:] > 0, cum_probs[:, -1:], 1.0)
+
+        # Per-row outcome tuples of the successors with nonzero probability
+        self._outcomes = []
+        self._cum = []
+        for ns, p, r, t, c in zip(self.next_states.tolist(), probs.reshape(rows, k).tolist(),
+                                  self.rewards.tolist(), self.terminal.tolist(), self.cum_probs.tolist()):
+            keep = [i for i in range(k) if p[i] > 0] or [0]
+            self._outcomes.append(tuple((ns[i], r[i], t[i]) for i in keep))
+            self._cum.append([c[i] for i in keep])
+
+        if initial_distribution is None:
+            starts = np.unique(np.asarray(env.get_initial_states(), dtype=np.int64))
+            initial_distribution = np.zeros(self.n_states)
+            initial_distribution[starts] = 1.0
+        initial_distribution = np.asarray(initial_distribution, dtype=float)
+        self.initial_states = np.flatnonzero(initial_distribution).tolist()
+        self._initial_cum = (np.cumsum(initial_distribution[self.initial_states]) / initial_distribution.sum()).tolist()
+
+        self.batch_states = np.zeros(0, dtype=np.int64)
+        self.batch_steps = np.zeros(0, dtype=np.int64)
+
+    def _uniform(self):
+        u = next(self._uniforms, None)
+        if u is None:
+            self._uniforms = iter(self.rng.random(UNIFORM_BLOCK_SIZE).tolist())
+            u = next(self._uniforms)
+        return u
+
+    def _pick(self, cum):
+        if len(cum) == 1:
+            return 0
+        return min(bisect_right(cum, self._uniform()), len(cum) - 1)
+
+    def reset(self):
+        self.state = self.initial_states[self._pick(self._initial_cum)]
+        self.done = False
+        self.steps = 0
+        return self.state
+
+    def sample(self, state, action):
+        """Advance the episode from state with action and return (next_state, reward, done)"""
+        row = state * self.n_actions + action
+        next_state, reward, done = self._outcomes[row][self._pick(self._cum[row])]
+        self.steps += 1
+        if self.max_steps is not None and self.steps >= self.max_steps:
+            done = True
+        return next_state, reward, done
+
+    def step(self, action):
+        if self.done:
+            return self.state, 0, True, {}
+        self.state, reward, self.done = self.sample(self.state, action)
+        return self.state, reward, self.done, {}
+
+    def _initial_batch(self, n):
+        if len(self.initial_states) == 1:
+            return np.full(n, self.initial_states[0], dtype=np.int64)
+        k = np.searchsorted(self._initial_cum, self.rng.random(n), side='right')
+        return np.asarray(self.initial_states)[np.minimum(k, len(self.initial_states) - 1)]
+
+    def _sample_batch(self, states, actions):
+        """(next_states, rewards, terminal) arrays for one (state, action) pair per copy"""
+        rows = states * self.n_actions + actions
+        if self.cum_probs.shape[1] == 1:
+            return self.next_states[rows, 0], self.rewards[rows, 0], self.terminal[rows, 0]
+        # The first successor whose cumulative probability exceeds u; padding slots never qualify
+        k = (self.cum_probs[rows] <= self.rng.random(len(rows))[:, None]).sum(axis=1)
+        k = np.minimum(k, self.cum_probs.shape[1] - 1)
+        return self.next_states[rows, k], self.rewards[rows, k], self.terminal[rows, k]
+
+    def _transition_batch(self, states, actions):
+        next_states, rewards, dones = self._sample_batch(states, actions)
+        if self.max_steps is not None:
+            dones = dones | (self.batch_steps >= self.max_steps)
+        return next_states, rewards, dones
+
+    def reset_batch(self, n):
+        """Start n copies of the environment and return their states"""
+        self.batch_states = self._initial_batch(n)
+        self.batch_steps = np.zeros(n, dtype=np.int64)
+        return self.batch_states.copy()
+
+    def restart_batch(self, mask):
+        """Start new episodes in the copies selected by a boolean mask"""
+        self.batch_states[mask] = self._initial_batch(int(np.count_nonzero(mask)))
+        self.batch_steps[mask] = 0
+        return self.batch_states.copy()
+
+    def step_batch(self, actions):
+        """Step every copy once and return (next_states, rewards, dones)
+
+        next_states are the successors reached by this step; copies that are
+        done have already been restarted in batch_states.
+        """
+        self.batch_steps += 1
+        next_states, rewards, dones = self._transition_batch(self.batch_states, np.asarray(actions))
+        self.batch_states = next_states.copy()
+        if dones.any():
+            self.restart_batch(dones)
+        return next_states, rewards, dones
+
+    def seed(self, seed=None):
+        self.rng = np.random.default_rng(seed)
+        self._uniforms = iter(())
+
+    def render(self, mode='rgb_array'):
+        return self.env.render(mode)
+
+    def get_state_space_size(self):
+        return self.n_states
+
+    def get_action_space_size(self):
+        return self.n_actions
+
+    def get_transition_model(self):
+        return self.env.get_transition_model()
+
+    def get_transition_prob(self, s, a):
+        return self.env.get_transition_prob(s, a)
+
+    def get_reward_bound(self):
+        return self.env.get_reward_bound()
+
+    def get_initial_states(self):
+        return self.initial_states
@@ -74,6 +74,25 @@ class CorridorEnv(BaseEnvironment):
     def get_action_space_size(self):
         return 2  # left, right
     
+    def get_transition_model(self):
+        """Vectorized equivalent of get_transition_prob for all (s, a)"""
+        s = np.arange(self.length)
+        next_states = np.stack([np.maximum(0, s - 1), np.minimum(self.length - 1, s + 1)], axis=1)
+        rewards = np.where(next_states == self.goal_pos, 1.0, -0.01)
+        
+        # The goal is absorbing with no further reward
+        next_states[self.goal_pos] = self.goal_pos
+        rewards[self.goal_pos] = 0.0
+        
+        terminal = next_states == self.goal_pos
+        return next_states[..., None], np.ones(next_states.shape + (1,)), rewards[..., None], terminal[..., None]
+    
+    def get_reward_bound(self):
+        return 1.0
+    
+    def get_model_key(self):
+        return ('Corridor', self.length)
+    
     def get_transition_prob(self, s, a):
         """Get transition probabilities for model-based methods"""
         if s == self.goal_pos:
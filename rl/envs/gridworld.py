@@ -116,6 +116,32 @@ class GridWorldEnv(BaseEnvironment):
     def _get_pos_from_state_id(self, sid):
         return divmod(sid, self.size)
 
+    def get_transition_model(self):
+        ys, xs = np.divmod(np.arange(self.size ** 2), self.size)
+        blocked = np.zeros((self.size, self.size), dtype=bool)
+        for y, x in self.obstacles:
+            blocked[y, x] = True
+        goal = self._get_state_id(self.goal_pos)
+
+        next_states = np.empty((self.size ** 2, 4), dtype=np.int64)
+        for a, (dy, dx) in self.action_map.items():
+            ny, nx = ys + dy, xs + dx
+            inside = (0 <= ny) & (ny < self.size) & (0 <= nx) & (nx < self.size)
+            ok = inside & ~blocked[np.clip(ny, 0, self.size - 1), np.clip(nx, 0, self.size - 1)]
+            next_states[:, a] = np.where(ok, ny * self.size + nx, ys * self.size + xs)
+
+        rewards = np.where(next_states == goal, self.goal_reward, self.step_cost)
+        return next_states[..., None], np.ones(next_states.shape + (1,)), rewards[..., None], (next_states == goal)[..., None]
+
+    def get_reward_bound(self):
+        return max(self.goal_reward, self.step_cost)
+
+    def get_model_key(self):
+        return ('GridWorld', self.size, self.goal_reward, self.step_cost, tuple(map(tuple, self.obstacles)))
+
+    def get_grid_shape(self):
+        return (self.size, self.size)
+
     def get_transition_prob(self, sid, a):
         y, x = self._get_pos_from_state_id(sid)
         dy, dx = self.action_map[a]
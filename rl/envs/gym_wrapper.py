@@ -1,3 +1,5 @@
+import multiprocessing as mp
+import os
 import gymnasium as gym
 import numpy as np
 import matplotlib.pyplot as plt
@@ -9,16 +11,19 @@ from rl.envs.base import BaseEnvironment
 class GymnasiumEnvWrapper(BaseEnvironment):
   """Wrapper for Gymnasium environments"""
   
-  def __init__(self, env_id, name, is_slippery=None):
+  def __init__(self, env_id, name, is_slippery=None, vector_mode='sync'):
     super().__init__()
     self.env_id = env_id
     self.env_name = name
+    self.is_slippery = is_slippery
+    # 'sync' steps vectorized copies in this process, 'async' in a pool of worker processes
+    self.vector_mode = vector_mode
+    # Seed for the next reset, set by seed()
+    self.pending_seed = None
     
     # Handle FrozenLake slippery parameter
-    if is_slippery is not None and 'FrozenLake' in env_id:
-      self.env = gym.make(env_id, render_mode='rgb_array', is_slippery=is_slippery)
-    else:
-      self.env = gym.make(env_id, render_mode='rgb_array')
+    self.make_kwargs = {'is_slippery': is_slippery} if is_slippery is not None and 'FrozenLake' in env_id else {}
+    self.env = gym.make(env_id, render_mode='rgb_array', **self.make_kwargs)
     
     self.is_discrete_state = isinstance(self.env.observation_space, gym.spaces.Discrete)
     self.is_tuple_state = isinstance(self.env.observation_space, gym.spaces.Tuple)
@@ -31,7 +36,8 @@ class GymnasiumEnvWrapper(BaseEnvironment):
   
   def reset(self):
     """Reset environment"""
-    obs, info = self.env.reset()
+    obs, info = self.env.reset(seed=self.pending_seed)
+    self.pending_seed = None
     self.state = obs
     self.done = False
     
@@ -182,6 +188,80 @@ class GymnasiumEnvWrapper(BaseEnvironment):
       
     return sid
   
+  def get_transition_model(self):
+    """Convert the toy-text P dict to (next_states, probs, rewards, terminal) arrays"""
+    env_check = self.env.unwrapped if hasattr(self.env, 'unwrapped') else self.env
+    
+    if not hasattr(env_check, 'P'):
+      raise NotImplementedError(
+        f"{self.env_name} doesn't support model-based methods"
+      )
+    
+    n_states, n_actions = self.get_state_space_size(), self.get_action_space_size()
+    k = max(len(trans) for actions in env_check.P.values() for trans in actions.values())
+    
+    next_states = np.zeros((n_states, n_actions, k), dtype=np.int64)
+    probs = np.zeros((n_states, n_actions, k))
+    rewards = np.zeros((n_states, n_actions, k))
+    terminal = np.zeros((n_states, n_actions, k), dtype=bool)
+    for s, actions in env_check.P.items():
+      for a, trans in actions.items():
+        for i, (prob, next_s, r, done) in enumerate(trans):
+          next_states[s, a, i], probs[s, a, i], rewards[s, a, i], terminal[s, a, i] = next_s, prob, r, done
+    
+    return next_states, probs, rewards, terminal
+  
+  def seed(self, seed=None):
+    """Seed the wrapped environment at its next reset, as gymnasium's reset(seed=...) does"""
+    self.pending_seed = seed
+  
+  def get_reward_bound(self):
+    """Largest reward in the toy-text P dict the environment already holds, else None"""
+    env_check = self.env.unwrapped if hasattr(self.env, 'unwrapped') else self.env
+    
+    if not hasattr(env_check, 'P'):
+      return None
+    return max(r for actions in env_check.P.values() for trans in actions.values() for _, _, r, _ in trans)
+  
+  def get_model_key(self):
+    return ('Gymnasium', self.env_id, self.is_slippery)
+  
+  def get_initial_states(self):
+    """Initial states from the toy-text start distribution, if exposed"""
+    env_check = self.env.unwrapped if hasattr(self.env, 'unwrapped') else self.env
+    
+    if hasattr(env_check, 'initial_state_distrib'):
+      return [int(s) for s in np.flatnonzero(env_check.initial_state_distrib)]
+    return super().get_initial_states()
+  
+  def compile(self, seed=None):
+    """CompiledEnv keeping the toy-text start distribution and the TimeLimit of the spec"""
+    from rl.envs.compiled import CompiledEnv
+    env_check = self.env.unwrapped if hasattr(self.env, 'unwrapped') else self.env
+    
+    return CompiledEnv(
+      self, seed=seed,
+      max_steps=self.env.spec.max_episode_steps if self.env.spec is not None else None,
+      initial_distribution=getattr(env_check, 'initial_state_distrib', None)
+    )
+  
+  def vectorize(self, seed=None):
+    """Compiled tables for toy-text models, otherwise a GymnasiumVectorEnv"""
+    try:
+      return self.compile(seed=seed)
+    except NotImplementedError:
+      n_workers = os.cpu_count() if self.vector_mode == 'async' else 0
+      return GymnasiumVectorEnv(self, seed=seed, n_workers=n_workers)
+  
+  def state_encoding(self):
+    """Picklable description of how observations map to state ids, for batch_state_ids"""
+    if self.is_discrete_state:
+      return ('discrete', None)
+    elif self.is_tuple_state:
+      return ('tuple', [space.n for space in self.env.observation_space.spaces])
+    else:
+      return ('bins', self.state_bins)
+  
   def get_transition_prob(self, s, a):
     """Get transition probs (only for specific envs)"""
     env_check = self.env.unwrapped if hasattr(self.env, 'unwrapped') else self.env
@@ -200,3 +280,157 @@ class GymnasiumEnvWrapper(BaseEnvironment):
       raise NotImplementedError(
         f"{self.env_name} doesn't support model-based methods"
       )
+
+
+def batch_state_ids(obs, encoding):
+  """State ids of a batch of observations, numbered like GymnasiumEnvWrapper's step and reset"""
+  kind, data = encoding
+  if kind == 'discrete':
+    return np.asarray(obs, dtype=np.int64)
+  
+  if kind == 'tuple':
+    sid = np.zeros(len(obs[0]), dtype=np.int64)
+    for values, n in zip(obs, data):
+      sid = sid * n + np.asarray(values, dtype=np.int64)
+    return sid
+  
+  # Mixed-radix digits in the same order as GymnasiumEnvWrapper._discretize
+  obs = np.asarray(obs)
+  sid = np.zeros(len(obs), dtype=np.int64)
+  for i, bins in enumerate(data):
+    sid = sid * (len(bins) + 1) + np.digitize(obs[:, i], bins)
+  return sid
+
+
+def _stack_observations(observations, encoding):
+  """Batch a list of single observations in the layout a vector env returns"""
+  if encoding[0] == 'tuple':
+    return tuple(np.array(values) for values in zip(*observations))
+  return np.stack([np.asarray(o) for o in observations])
+
+
+def _step_vector(vec, actions, encoding):
+  """Step a SyncVectorEnv; return (next_ids, current_ids, rewards, dones)
+
+  Finished copies are reset by the vector env; their next_ids come from the
+  final observation rather than from the observation after the reset.
+  """
+  obs, rewards, terminated, truncated, infos = vec.step(actions)
+  current = batch_state_ids(obs, encoding)
+  next_ids = current.copy()
+  if '_final_observation' in infos:
+    finished = np.flatnonzero(infos['_final_observation'])
+    finals = _stack_observations([infos['final_observation'][i] for i in finished], encoding)
+    next_ids[finished] = batch_state_ids(finals, encoding)
+  return next_ids, current, np.asarray(rewards, dtype=float), terminated | truncated
+
+
+def _make_vector(env_id, make_kwargs, n):
+  return gym.vector.SyncVectorEnv([lambda: gym.make(env_id, **make_kwargs) for _ in range(n)])
+
+
+def _restart(vec, indices, encoding):
+  return batch_state_ids(_stack_observations([vec.envs[i].reset()[0] for i in indices], encoding), encoding)
+
+
+def _vector_worker(conn, env_id, make_kwargs, n, seed, encoding):
+  vec = _make_vector(env_id, make_kwargs, n)
+  conn.send(batch_state_ids(vec.reset(seed=seed)[0], encoding))
+  while True:
+    command, data = conn.recv()
+    if command == 'step':
+      conn.send(_step_vector(vec, data, encoding))
+    elif command == 'restart':
+      conn.send(_restart(vec, data, encoding))
+    else:
+      vec.close()
+      conn.close()
+      break
+
+
+class GymnasiumVectorEnv:
+  """Batch stepping of copies of a wrapped Gymnasium environment (see BaseEnvironment.vectorize)
+
+  The copies run in a gymnasium SyncVectorEnv, or with n_workers > 0 in that
+  many worker processes that each step a SyncVectorEnv over a slice of them,
+  which pays off for environments with expensive dynamics such as Acrobot.
+  Observations are discretized for all copies at once with batch_state_ids.
+  """
+  
+  def __init__(self, wrapper, seed=None, n_workers=0):
+    self.env_id = wrapper.env_id
+    self.make_kwargs = wrapper.make_kwargs
+    self.encoding = wrapper.state_encoding()
+    self.seed = int(np.random.default_rng(seed).integers(2 ** 31))
+    self.n_workers = n_workers
+    self.vec = None
+    self.workers = []
+    self.slices = []
+    self.batch_states = np.zeros(0, dtype=np.int64)
+  
+  def reset_batch(self, n):
+    """Start n copies of the environment and return their states"""
+    self.close()
+    if self.n_workers == 0:
+      self.vec = _make_vector(self.env_id, self.make_kwargs, n)
+      self.batch_states = batch_state_ids(self.vec.reset(seed=self.seed)[0], self.encoding)
+      return self.batch_states.copy()
+    
+    bounds = np.linspace(0, n, min(self.n_workers, n) + 1).astype(int).tolist()
+    self.slices = [slice(lo, hi) for lo, hi in zip(bounds[:-1], bounds[1:])]
+    for part in self.slices:
+      conn, child = mp.Pipe()
+      process = mp.Process(target=_vector_worker, daemon=True,
+                           args=(child, self.env_id, self.make_kwargs, part.stop - part.start,
+                                 self.seed + part.start, self.encoding))
+      process.start()
+      child.close()
+      self.workers.append((conn, process))
+    self.batch_states = np.concatenate([conn.recv() for conn, _ in self.workers])
+    return self.batch_states.copy()
+  
+  def step_batch(self, actions):
+    """Step every copy once and return (next_states, rewards, dones)"""
+    actions = np.asarray(actions)
+    if self.vec is not None:
+      next_states, self.batch_states, rewards, dones = _step_vector(self.vec, actions, self.encoding)
+      return next_states, rewards, dones
+    
+    for (conn, _), part in zip(self.workers, self.slices):
+      conn.send(('step', actions[part]))
+    results = [conn.recv() for conn, _ in self.workers]
+    next_states, self.batch_states, rewards, dones = (np.concatenate(r) for r in zip(*results))
+    return next_states, rewards, dones
+  
+  def restart_batch(self, mask):
+    """Start new episodes in the copies selected by a boolean mask"""
+    indices = np.flatnonzero(mask)
+    if self.vec is not None:
+      self.batch_states[indices] = _restart(self.vec, indices, self.encoding)
+      return self.batch_states.copy()
+    
+    for (conn, _), part in zip(self.workers, self.slices):
+      local = indices[(indices >= part.start) & (indices < part.stop)] - part.start
+      if len(local):
+        conn.send(('restart', local))
+        self.batch_states[local + part.start] = conn.recv()
+    return self.batch_states.copy()
+  
+  def close(self):
+    """Shut down the copies and worker processes; safe to call more than once"""
+    vec, workers = self.vec, self.workers
+    self.vec, self.workers, self.slices = None, [], []
+    if vec is not None:
+      vec.close()
+    for conn, _ in workers:
+      # A worker that already died has closed its end of the pipe
+      try:
+        conn.send(('close', None))
+      except OSError:
+        pass
+      conn.close()
+    for _, process in workers:
+      process.join(timeout=5)
+      if process.is_alive():
+        process.terminate()
+        process.join()
@@ -1,6 +1,8 @@
 """Maze Solver Environment"""
+import hashlib
 import numpy as np
 from rl.envs.base import BaseEnvironment
+from rl.envs.compiled import CompiledEnv
 from collections import deque
 
 
@@ -11,11 +13,13 @@ class MazeEnv(BaseEnvironment):
         self.size, self.difficulty, self.regenerate_on_reset = size, difficulty, regenerate_on_reset
         self.wall_density = {'easy': 0.15, 'medium': 0.25, 'hard': 0.35}[difficulty]
         self.max_steps = size * size * 2
+        # Layouts come from the global numpy state until seed() is called
+        self.rng = np.random
         self.maze, self.agent_pos, self.goal_pos, self.done, self.steps = self._generate_maze(), None, None, False, 0
         self.reset()
 
     def _generate_maze(self):
-        maze = (np.random.rand(self.size, self.size) < self.wall_density).astype(int)
+        maze = (self.rng.random((self.size, self.size)) < self.wall_density).astype(int)
         self.agent_pos, self.goal_pos = [0, 0], [self.size - 1, self.size - 1]
         maze[0, 0] = maze[-1, -1] = 0
 
@@ -117,12 +121,53 @@ class MazeEnv(BaseEnvironment):
 
         return img
 
+    def seed(self, seed=None):
+        # Only layouts generated on later resets depend on the seed
+        self.rng = np.random.default_rng(seed)
+
     def get_state_space_size(self):
         return self.size ** 2
 
     def get_action_space_size(self):
         return 4
 
+    def get_transition_model(self):
+        """Vectorized equivalent of get_transition_prob for all (s, a)"""
+        ys, xs = np.divmod(np.arange(self.size ** 2), self.size)
+        goal = self.goal_pos[0] * self.size + self.goal_pos[1]
+
+        next_states = np.empty((self.size ** 2, 4), dtype=np.int64)
+        rewards = np.empty((self.size ** 2, 4))
+        for a, (dx, dy) in enumerate([(-1, 0), (0, 1), (1, 0), (0, -1)]):
+            nx, ny = ys + dx, xs + dy
+            inside = (0 <= nx) & (nx < self.size) & (0 <= ny) & (ny < self.size)
+            ok = inside & (self.maze[np.clip(nx, 0, self.size - 1), np.clip(ny, 0, self.size - 1)] == 0)
+            next_states[:, a] = np.where(ok, nx * self.size + ny, ys * self.size + xs)
+            rewards[:, a] = np.where(ok, np.where(next_states[:, a] == goal, 10, -0.01), -0.1)
+
+        terminal = rewards == 10
+        return next_states[..., None], np.ones(next_states.shape + (1,)), rewards[..., None], terminal[..., None]
+
+    def get_reward_bound(self):
+        # Largest reward of get_transition_prob; the time bonus only exists in step()
+        return 10.0
+
+    def get_model_key(self):
+        # Mazes are random, so the layout itself identifies the model
+        return ('Maze', self.size, hashlib.sha1(self.maze.astype(np.int8).tobytes()).hexdigest())
+
+    def get_grid_shape(self):
+        return (self.size, self.size)
+
+    def get_initial_states(self):
+        # reset() would regenerate the maze when regenerate_on_reset is set
+        return [0]
+
+    def compile(self, seed=None):
+        if self.regenerate_on_reset:
+            raise NotImplementedError("A maze regenerated on every reset has no fixed model")
+        return CompiledMazeEnv(self, seed=seed, max_steps=self.max_steps)
+
     def get_transition_prob(self, state, action):
         y, x = divmod(state, self.size)
         dx, dy = [(-1, 0), (0, 1), (1, 0), (0, -1)][action]
@@ -139,3 +184,30 @@ class MazeEnv(BaseEnvironment):
                 reward = -0.01
         
         return {next_state: (1.0, reward)}
+
+
+class CompiledMazeEnv(CompiledEnv):
+    """CompiledEnv with MazeEnv's step budget and time bonus for reaching the goal"""
+
+    def sample(self, state, action):
+        self.steps += 1
+        next_state, _, done = self._outcomes[state * self.n_actions + action][0]
+
+        # Bumping into a wall never ends the episode, even once the budget is spent
+        if next_state == state:
+            return state, -0.1, False
+        if done:
+            return next_state, 10 + max(0, 1 - self.steps / self.max_steps), True
+        if self.steps >= self.max_steps:
+            return next_state, -1, True
+        return next_state, -0.01, False
+
+    def _transition_batch(self, states, actions):
+        next_states, _, goal = self._sample_batch(states, actions)
+        bumped = next_states == states
+        timeout = ~bumped & ~goal & (self.batch_steps >= self.max_steps)
+
+        rewards = np.where(timeout, -1.0, -0.01)
+        rewards = np.where(goal, 10 + np.maximum(0, 1 - self.batch_steps / self.max_steps), rewards)
+        rewards = np.where(bumped, -0.1, rewards)
+        return next_states, rewards, ~bumped & (goal | timeout)
@@ -7,6 +7,8 @@ class TicTacToeEnv(BaseEnvironment):
 
   def __init__(self):
     super().__init__()
+    # The random opponent draws from the global numpy state until seed() is called
+    self.rng = np.random
     self.reset()
 
   def reset(self):
@@ -45,7 +47,7 @@ class TicTacToeEnv(BaseEnvironment):
     self.current_player = -1
     valid = self.get_valid_actions()
     if valid:
-      r, c = divmod(np.random.choice(valid), 3)
+      r, c = divmod(self.rng.choice(valid), 3)
       self.board[r, c] = -1
       result = self._check_winner()
       if result is not None:
@@ -83,6 +85,9 @@ class TicTacToeEnv(BaseEnvironment):
 
     return img
 
+  def seed(self, seed=None):
+    self.rng = np.random.default_rng(seed)
+
   def get_state_space_size(self):
     return 3 ** 9
 
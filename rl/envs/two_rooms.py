@@ -100,6 +100,33 @@ class TwoRoomsEnv(BaseEnvironment):
     def _get_pos_from_state_id(self, sid):
         return divmod(sid, self.size)
     
+    def get_transition_model(self):
+        """Vectorized equivalent of get_transition_prob for all (s, a)"""
+        ys, xs = np.divmod(np.arange(self.size ** 2), self.size)
+        wall_x = self.size // 2
+        goal = self._get_state_id(self.goal_pos)
+        
+        next_states = np.empty((self.size ** 2, 4), dtype=np.int64)
+        for a, (dy, dx) in self.action_map.items():
+            ny, nx = ys + dy, xs + dx
+            inside = (0 <= ny) & (ny < self.size) & (0 <= nx) & (nx < self.size)
+            crosses = ((xs < wall_x) & (wall_x <= nx)) | ((nx <= wall_x) & (wall_x < xs))
+            door = (ny == self.door_pos[0]) & (wall_x == self.door_pos[1])
+            ok = inside & (~crosses | door)
+            next_states[:, a] = np.where(ok, ny * self.size + nx, ys * self.size + xs)
+        
+        rewards = np.where(next_states == goal, 1.0, -0.01)
+        return next_states[..., None], np.ones(next_states.shape + (1,)), rewards[..., None], (next_states == goal)[..., None]
+    
+    def get_reward_bound(self):
+        return 1.0
+    
+    def get_model_key(self):
+        return ('TwoRooms', self.size)
+    
+    def get_grid_shape(self):
+        return (self.size, self.size)
+
     def get_transition_prob(self, sid, a):
         """Get transition probabilities for model-based methods"""
         y, x = self._get_pos_from_state_id(sid)
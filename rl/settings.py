@@ -17,6 +17,20 @@ ALGORITHMS = {
         'complexity': 'Medium',
         'requires_model': True
     },
+    'RTDP': {
+        'type': 'Dynamic Programming',
+        'description': 'Backs up only the states visited by greedy trials from the start.',
+        'features': ['Model-based', 'Lazy model queries', 'Scales with reachable region'],
+        'complexity': 'Medium',
+        'requires_model': True
+    },
+    'Minimax': {
+        'type': 'Game Solver',
+        'description': 'Solves TicTacToe exactly by backward induction over symmetric positions.',
+        'features': ['TicTacToe only', 'Exact values', 'Optimal baseline'],
+        'complexity': 'Low',
+        'requires_model': True
+    },
     'Monte Carlo': {
         'type': 'Monte Carlo',
         'description': 'Learns from complete episode returns.',
@@ -193,7 +207,9 @@ ENVIRONMENTS = {
         'difficulty': 'Hard',
         'state_space': 'Continuous',
         'action_space': 'Discrete',
-        'env_id': 'Acrobot-v1'
+        'env_id': 'Acrobot-v1',
+        # Costly dynamics: vectorized copies are stepped in worker processes
+        'vector_mode': 'async'
     },
     
     # Maze Variations (6 total)